@@ -0,0 +1,178 @@
+from slack_bolt.async_app import AsyncApp
+from slack_bolt.adapter.socket_mode.async_handler import AsyncSocketModeHandler
+import os
+import re
+import asyncio
+import logging
+from dotenv import load_dotenv
+from subFunctions.commands.bot import Bot
+from subFunctions.assetRegistry.registry import AsyncAssetRegistry
+from subFunctions.procMenu.views import procSelections, procOptions, selectionMessages
+from subFunctions.spoiler.blocks import spoilerTitle, spoilerBlocks, revealBlocks
+from subFunctions.metrics.metrics import acommandMetrics, listenerLatency
+from subFunctions.metrics.logs import setupLogging, kv
+from subFunctions.slackClient.asyncClients import getAsyncClient, aclientMiddleware, closeSession
+
+
+# asyncio runtime: the same Bot as main.py on AsyncApp. Slack calls are
+# awaited on one event loop; card rendering runs on the CardRenderer process
+# pool and other blocking work (passGen) in the default executor, so slow
+# commands no longer each hold a thread.
+
+load_dotenv()
+setupLogging()
+log = logging.getLogger('chatListener')
+
+client = getAsyncClient(os.getenv('botToken'))
+bot = Bot(client, AsyncAssetRegistry, runtime='async')
+bot.router.use(acommandMetrics)
+# Awaits the effects each command yields
+bot.router.use(bot.amiddleware)
+
+# Initialize the app
+app = AsyncApp(client=client)
+app.use(aclientMiddleware(client))
+# Drop chatter, bot and unauthorized messages before listener dispatch
+app.use(bot.messageFilter.amiddleware)
+if bot.coordinator is not None:
+    # Each event/interaction is handled by the first instance to claim it;
+    # after the filter, so dropped chatter never costs a database write
+    app.use(bot.coordinator.amiddleware)
+
+
+@app.event("message")
+async def messageEvent(body, say, logger):
+    # Only authorized `--` commands get here, see MessageFilter
+    ctx = bot.commandCtx(body, say)
+    if not await bot.router.adispatch(ctx):
+        # Invalid Command Result
+        await say("Given Command holds no action!")
+        log.info("unknown command", extra=kv(cmnd=ctx.cmnd))
+
+
+@app.command("/echo")
+@listenerLatency.time(listener="/echo")
+async def repeatText(ack, respond, command, say):
+    await ack()
+    await say(f"{command['text']}")
+
+
+@app.command("/procmenu")
+@listenerLatency.time(listener="/procmenu")
+async def handleProcDisplay(ack, body, client):
+    await ack()
+
+    try:
+        await client.views_open(
+            trigger_id=body["trigger_id"],
+            view=bot.procMenuView(body["channel_id"])
+        )
+    except Exception as e:
+        log.warning("Modal error: %s", e)
+        await client.chat_postEphemeral(
+            channel=body["channel_id"],
+            user=body["user_id"],
+            text="❌ Modal failed to open. Please try again."
+        )
+
+
+@app.action(re.compile(r".*_select"))
+@listenerLatency.time(listener="_select")
+async def handleProcAction(ack):
+    await ack()
+
+
+@app.options(re.compile(r".*_select"))
+@listenerLatency.time(listener="_select options")
+async def handleProcOptions(ack, body):
+    # Serves external_select categories too large for static options
+    cfg = bot.config.current()
+    await ack(options=procOptions(cfg.proc, body["action_id"], body.get("value", "")))
+
+
+@app.view("procHandler")
+@listenerLatency.time(listener="procHandler")
+async def handleProcSubmission(ack, body, view, client):
+    await ack()
+
+    # Get the original channel from private_metadata
+    ogCh = view.get("private_metadata") or body["user"]["id"]
+    selections = procSelections(view["state"]["values"], bot.config.current().proc)
+
+    if selections:
+        messages = selectionMessages(selections, bot.procBatched)
+        if bot.procBatched:
+            for message in messages:
+                await client.chat_postMessage(channel=ogCh, **message)
+        else:
+            await asyncio.gather(*(
+                client.chat_postMessage(channel=ogCh, **message) for message in messages))
+    else:
+        await client.chat_postMessage(
+            channel=ogCh,
+            text=f"❌ <@{body['user']['id']}> made no selections!"
+        )
+
+
+@app.command("/spoiler")
+@listenerLatency.time(listener="/spoiler")
+async def handleSpoiler(ack, respond, command, client):
+    await ack()
+
+    spoilerTxt = command['text'].strip()
+    if not spoilerTxt:
+        await respond(
+            "Please provide text for the spoiler. Usage: `/spoiler {message to be sent}`")
+        return
+
+    title = spoilerTitle(command, bot.config.current().parems)
+    spoilerID = await asyncio.to_thread(
+        bot.spoilers.add, title, spoilerTxt, command['channel_id'], command['user_id'])
+    await client.chat_postMessage(
+        channel=command['channel_id'],
+        blocks=spoilerBlocks(title, spoilerID),
+        text=f"Spoiler: {title}"
+    )
+
+
+@app.action("revealSpoiler")
+@listenerLatency.time(listener="revealSpoiler")
+async def handleReveal(ack, body, client, respond):
+    await ack()
+
+    userId = body['user']['id']
+    spoiler = await asyncio.to_thread(bot.spoilers.reveal, body['actions'][0]['value'], userId)
+    if spoiler is None:
+        await respond(text="⌛ This spoiler has expired, init.",
+                      response_type="ephemeral", replace_original=False)
+        return
+    title, spoilerTxt = spoiler
+
+    await client.chat_postEphemeral(
+        channel=body['channel']['id'],
+        user=userId,
+        text=f"Spoiler Revealed: **{title}**",
+        blocks=revealBlocks(title, spoilerTxt)
+    )
+
+
+@app.action("deleteReveal")
+@listenerLatency.time(listener="deleteReveal")
+async def handledeleteReveal(ack, respond):
+    await ack()
+    await respond(delete_original=True, response_type="ephemeral")
+
+
+async def main():
+    bot.loop = asyncio.get_running_loop()
+    print("-"*50)
+    bot.start()
+    handler = AsyncSocketModeHandler(app, bot.appToken)
+    try:
+        await handler.start_async()
+    finally:
+        await closeSession()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,361 @@
+"""
+Benchmark the bot's hot paths against a local fake Slack (bench/fakeSlack.py).
+
+    python bench/benchmark.py                        # full run, JSON report on stdout
+    python bench/benchmark.py --save bench/last.json
+    python bench/benchmark.py --baseline bench/last.json --tolerance 0.2
+
+Phases:
+    events       synthetic `message` events replayed through the Bolt app
+                 into messageEvent, until every reply reached the fake API
+    interactive  /echo and /spoiler commands, revealSpoiler/deleteReveal
+                 button clicks (block_actions) and /procmenu submissions
+                 picking one command from every category
+    deletes      delChat.deleteMessage sweeping a seeded channel, optionally
+                 with server-side chat.delete rate limiting (429 + Retry-After)
+    cards        CardRenderer.submit throughput and submit-to-PNG latency p50/p99
+                 on a generated template, queueing and worker IPC included;
+                 without a rasterizer the workers only fill the SVG, which the
+                 report labels cardStage 'fill-only'
+
+Everything the bot writes (card cache, asset registry) goes to a throwaway
+sandbox directory. With --baseline the run exits 1 when any metric is worse
+than the baseline by more than --tolerance.
+"""
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import resource
+import tempfile
+import threading
+from collections import deque
+
+BENCH = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH)
+sys.path.insert(0, ROOT)
+sys.path.insert(0, BENCH)
+
+from fakeSlack import FakeSlack  # noqa: E402
+from replay import (  # noqa: E402
+    Replayer, messagePayload, commandPayload, actionPayload, viewPayload, buttonValue)
+
+
+# metric -> True when higher is better
+DIRECTION = {
+    'eventsPerSec': True,
+    'interactivePerSec': True,
+    'deletesPerSec': True,
+    'cardsPerSec': True,
+    'cardP50': False,
+    'cardP99': False,
+    'rssMB': False,
+}
+
+# (text, user): commands, an unknown command, an outsider and plain chatter
+EVENT_MIX = [
+    ('--comL', 'UBENCH'),
+    ('--sayL', 'UBENCH'),
+    ('--list/img', 'UBENCH'),
+    ('--say/jojoPiano', 'UBENCH'),
+    ('--nope', 'UBENCH'),
+    ('--comL', 'UOUTSIDER'),
+    ('just chatting', 'UBENCH'),
+]
+
+CARD_SVG = """<?xml version="1.0" encoding="UTF-8"?>
+<svg xmlns="http://www.w3.org/2000/svg" width="750" height="1050" viewBox="0 0 750 1050">
+  <rect width="750" height="1050" fill="#111"/>
+  <text x="60" y="200" font-size="40" fill="#fff">top</text>
+  <text x="60" y="520" font-size="24" fill="#888">blank cards</text>
+  <text x="60" y="800" font-size="40" fill="#fff">bottom</text>
+</svg>
+"""
+
+
+def percentile(samples, q):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def rssMB():
+    # ru_maxrss is KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def sandbox():
+    """
+    Copy the JSON config and media into a temp dir and work from there.
+    """
+    from subFunctions.config.config import CONFIG_FILES
+    tmp = tempfile.mkdtemp(prefix='chatListener-bench-')
+    for path in CONFIG_FILES.values():
+        shutil.copy(os.path.join(ROOT, path), tmp)
+    for folder in ('img', 'audio'):
+        shutil.copytree(os.path.join(ROOT, folder), os.path.join(tmp, folder))
+    os.chdir(tmp)
+    return tmp
+
+
+def loadBot(fake):
+    """
+    Import main.py with its Slack client pointed at the fake API.
+    """
+    os.environ.update({
+        'botToken': 'xoxb-bench',
+        'userToken': 'xoxp-bench',
+        'socketToken': 'xapp-bench',
+        'userID': 'UBENCH',
+        'timeRange': '10',
+        'slackApiUrl': fake.url,
+    })
+    import main
+    return main
+
+
+def benchEvents(entry, fake, n):
+    replayer = Replayer(entry.app)
+    mix = [EVENT_MIX[i % len(EVENT_MIX)] for i in range(n)]
+    # Everything starting with -- gets exactly one reply or upload
+    expected = sum(1 for text, _ in mix if text.startswith('--'))
+    replies = ('chat.postMessage', 'files.completeUploadExternal')
+
+    # Warm up Bolt's authorization cache and the asset registry
+    replayer.send(messagePayload('--say/jojoPiano'))
+    fake.waitFor(replies, 1)
+    fake.reset()
+
+    start = time.perf_counter()
+    replayer.sendAll(messagePayload(text, user) for text, user in mix)
+    done = fake.waitFor(replies, expected, timeout=max(60, n / 10))
+    elapsed = time.perf_counter() - start
+    return {
+        'events': n,
+        'eventsPerSec': round(n / elapsed, 1),
+        'eventsComplete': done,
+    }
+
+
+def benchInteractive(entry, fake, n):
+    replayer = Replayer(entry.app)
+    responseUrl = fake.url.replace('/api/', '/response')
+    fake.reset()
+
+    # One spoiler to click on, as the bot itself posted it
+    replayer.send(commandPayload('/spoiler', 'the butler did it', responseUrl=responseUrl))
+    fake.waitFor('chat.postMessage', 1)
+    blocks = fake.posted[-1].get('blocks')
+    revealValue = buttonValue(blocks, 'revealSpoiler') if blocks else None
+    fake.reset()
+
+    # One pick per /procmenu category, which the bot answers in one message
+    proc = entry.bot.config.current().proc
+    picks = {f"{category}_select": next(iter(cmds)) for category, cmds in proc.items() if cmds}
+
+    payloads = []
+    for i in range(n):
+        kind = i % 5
+        if kind == 0:
+            payloads.append(commandPayload('/echo', f"echo {i}", responseUrl=responseUrl))
+        elif kind == 1:
+            payloads.append(commandPayload('/spoiler', f"spoiler {i}", responseUrl=responseUrl))
+        elif kind == 2 and revealValue is not None:
+            payloads.append(actionPayload('revealSpoiler', revealValue, responseUrl=responseUrl))
+        elif kind == 3 and entry.bot.procBatched:
+            payloads.append(viewPayload('procHandler', picks))
+        else:
+            payloads.append(actionPayload('deleteReveal', responseUrl=responseUrl))
+
+    start = time.perf_counter()
+    replayer.sendAll(payloads)
+    done = fake.waitFor(
+        ('chat.postMessage', 'chat.postEphemeral', 'response'), n, timeout=max(60, n / 10))
+    elapsed = time.perf_counter() - start
+    return {
+        'interactive': n,
+        'interactivePerSec': round(n / elapsed, 1),
+        'interactiveComplete': done,
+    }
+
+
+def benchDeletes(fake, messages, threads, replies, workers, clientRate):
+    from subFunctions.chatDelete import delChat
+    from subFunctions.slackClient.clients import limiter
+    if clientRate:
+        # Lift the Slack tier limits so the sweep machinery itself is measured
+        for method in delChat.SWEEP_METHODS:
+            limiter.setRate(method, clientRate * 60, max(1, clientRate // 10))
+
+    fake.seed('CSWEEP', messages, threads, replies)
+    fake.reset()
+    start = time.perf_counter()
+    stats = delChat.deleteMessage('xoxp-bench', 'CSWEEP', 10, workers=workers)
+    elapsed = time.perf_counter() - start
+    return {
+        'deletes': stats['deleted'],
+        'deletesFailed': stats['failed'],
+        'deletesPerSec': round(stats['deleted'] / elapsed, 1),
+        'deleteRateLimited': fake.count('chat.delete') - fake.deleted,
+    }
+
+
+def fillOnlyJob(card, topTxt, botTxt):
+    """
+    Stand-in for renderPool.renderJob when no rasterizer is installed: the
+    worker only fills the SVG, so the queue, caps and IPC are still measured.
+    """
+    from subFunctions.cardTemp.main import fillSVG
+    start = time.perf_counter()
+    svgCon, _ = fillSVG(card['cardImg'], topTxt, botTxt, card['maxChars'], card['lineHeight'])
+    return svgCon.encode('utf-8'), time.perf_counter() - start, 0.0
+
+
+def benchCards(n):
+    from subFunctions.cardTemp import renderPool
+    from subFunctions.cardTemp.renderPool import CardRenderer, CardBusy, RENDER_TIMEOUT
+    with open('benchCard.svg', 'w', encoding='utf-8') as f:
+        f.write(CARD_SVG)
+    words = "the quick brown fox jumps over a lazy dog while the bot renders cards".split()
+    card = {'cardImg': 'benchCard.svg', 'maxChars': 30, 'lineHeight': 2.5}
+
+    def text():
+        return ' '.join(random.choices(words, k=random.randint(4, 16)))
+
+    # No cache, so every card is a real trip through the pool
+    renderer = CardRenderer()
+    try:
+        # One render per worker first, so worker imports are not timed
+        stage = 'render'
+        try:
+            renderer.render('bench', card, text(), text())
+        except Exception as e:
+            print(f"⚠️ No rasterizer ({e}); cards only fill the SVG in the workers, "
+                  "reported as cardStage 'fill-only'", file=sys.stderr)
+            renderPool.renderJob = fillOnlyJob
+            stage = 'fill-only'
+        for future in [renderer.submit('bench', card, text(), text())
+                       for _ in range(renderer.workers)]:
+            future.result(RENDER_TIMEOUT)
+
+        samples = []
+        failed = busy = 0
+        finished = threading.Event()
+
+        def done(future, submitted):
+            nonlocal failed
+            if future.exception() is None:
+                samples.append(time.perf_counter() - submitted)
+            else:
+                failed += 1
+            if len(samples) + failed == n:
+                finished.set()
+
+        pending = deque()
+        start = time.perf_counter()
+        for _ in range(n):
+            while True:
+                submitted = time.perf_counter()
+                try:
+                    future = renderer.submit('bench', card, text(), text())
+                    break
+                except CardBusy:
+                    # Queue full: wait for the oldest card, as a client backing off would
+                    busy += 1
+                    pending.popleft().exception(RENDER_TIMEOUT)
+            future.add_done_callback(lambda f, t=submitted: done(f, t))
+            pending.append(future)
+        finished.wait(RENDER_TIMEOUT)
+        elapsed = time.perf_counter() - start
+    finally:
+        renderer.close()
+    if not samples:
+        raise RuntimeError(f"All {n} card renders failed")
+    return {
+        'cards': n,
+        'cardStage': stage,
+        'cardWorkers': renderer.workers,
+        'cardsPerSec': round(len(samples) / elapsed, 1),
+        'cardP50': round(percentile(samples, 0.5) * 1000, 2),
+        'cardP99': round(percentile(samples, 0.99) * 1000, 2),
+        'cardsFailed': failed,
+        'cardBusy': busy,
+    }
+
+
+def compare(report, baseline, tolerance, direction=DIRECTION):
+    """
+    Returns:
+        list: One line per metric that regressed beyond `tolerance`
+    """
+    regressions = []
+    for metric, higherIsBetter in direction.items():
+        old, new = baseline.get(metric), report.get(metric)
+        if not old or new is None:
+            continue
+        if metric.startswith('card') and report.get('cardStage') != baseline.get('cardStage'):
+            # A fill-only run is not comparable with a full render
+            continue
+        change = (new - old) / old
+        worse = -change if higherIsBetter else change
+        if worse > tolerance:
+            regressions.append(f"{metric}: {old} -> {new} ({change:+.0%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--messages', type=int, default=2000)
+    parser.add_argument('--interactive', type=int, default=400)
+    parser.add_argument('--deletes', type=int, default=1000)
+    parser.add_argument('--threads', type=int, default=20)
+    parser.add_argument('--replies', type=int, default=10)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--client-rate', type=int, default=500,
+                        help="chat.delete calls/sec our limiter allows (0 = real Slack tier)")
+    parser.add_argument('--server-rate', type=float, default=0,
+                        help="chat.delete calls/sec the fake allows before answering 429")
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help="seconds the fake adds to every API call")
+    parser.add_argument('--cards', type=int, default=100)
+    parser.add_argument('--save', help="write the report to this JSON file")
+    parser.add_argument('--baseline', help="JSON report to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.2)
+    args = parser.parse_args()
+
+    fake = FakeSlack(deleteRate=args.server_rate, latency=args.latency).start()
+    home = os.getcwd()
+    tmp = sandbox()
+    try:
+        entry = loadBot(fake)
+        report = {}
+        report.update(benchEvents(entry, fake, args.messages))
+        report.update(benchInteractive(entry, fake, args.interactive))
+        report.update(benchDeletes(
+            fake, args.deletes, args.threads, args.replies, args.workers, args.client_rate))
+        report.update(benchCards(args.cards))
+        report['rssMB'] = round(rssMB(), 1)
+    finally:
+        os.chdir(home)
+        fake.stop()
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    print(json.dumps(report, indent=2))
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"❌ Regression: {line}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print("✅ No regressions against baseline", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,313 @@
+import json
+import time
+import uuid
+import base64
+import hashlib
+import threading
+from collections import deque
+from urllib.parse import parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FakeSlack:
+    """
+    Local stand-in for the Slack Web API, good enough to drive the bot's
+    hot paths without touching real Slack.
+
+    Covers conversations.history / conversations.replies (cursor paginated,
+    `oldest` aware), chat.delete (rate limited with 429 + Retry-After),
+    the files_upload_v2 three-step flow, files.info, chat.postMessage,
+    chat.postEphemeral, views.open and auth.test. Every call is counted in
+    `calls`, so benchmarks can wait for side effects.
+
+    apps.connections.open hands out a websocket URL on the same server,
+    which completes the Socket Mode handshake, says hello and stamps
+    `connectedAt`; nothing else is ever sent over it.
+
+    Args:
+        deleteRate (float): chat.delete calls allowed per second (0 = unlimited)
+        latency (float): Seconds added to every response
+        pageSize (int): Maximum messages per history/replies page
+    """
+
+    def __init__(self, deleteRate=0, latency=0.0, pageSize=200):
+        self.deleteRate = deleteRate
+        self.latency = latency
+        self.pageSize = pageSize
+        self.lock = threading.Lock()
+        self.calls = {}
+        self.messages = {}
+        self.replies = {}
+        self.files = {}
+        self.deleted = 0
+        self.deleteStamps = deque()
+        self.posted = deque(maxlen=100)
+        self.connectedAt = None
+        self.server = None
+        self.cond = threading.Condition(self.lock)
+
+    # -- seeding -----------------------------------------------------------
+
+    def seed(self, channel, count, threads=0, repliesPerThread=0, start=None):
+        """
+        Fill `channel` with `count` messages, the first `threads` of which
+        carry `repliesPerThread` replies each.
+        """
+        start = start or time.time() - count - threads * repliesPerThread - 10
+        msgs = []
+        with self.lock:
+            for i in range(count):
+                ts = f"{start + i:.6f}"
+                msg = {'ts': ts, 'text': f"msg {i}", 'user': 'UBENCH'}
+                if i < threads:
+                    msg['reply_count'] = repliesPerThread
+                    msg['thread_ts'] = ts
+                    self.replies[(channel, ts)] = [dict(msg)] + [
+                        {'ts': f"{start + count + i * repliesPerThread + r:.6f}",
+                         'thread_ts': ts, 'text': f"reply {r}"}
+                        for r in range(repliesPerThread)
+                    ]
+                msgs.append(msg)
+            self.messages[channel] = msgs
+
+    # -- bookkeeping -------------------------------------------------------
+
+    def count(self, method):
+        with self.lock:
+            return self.calls.get(method, 0)
+
+    def waitFor(self, methods, n, timeout=60):
+        """
+        Block until the calls to `methods` (one name or a tuple) add up to `n`.
+        """
+        if isinstance(methods, str):
+            methods = (methods,)
+        with self.cond:
+            return self.cond.wait_for(
+                lambda: sum(self.calls.get(m, 0) for m in methods) >= n,
+                timeout=timeout)
+
+    def waitConnected(self, timeout=60):
+        """
+        Returns:
+            float: time.perf_counter() of the next Socket Mode handshake, or None
+        """
+        with self.cond:
+            self.cond.wait_for(lambda: self.connectedAt is not None, timeout=timeout)
+            return self.connectedAt
+
+    def reset(self):
+        with self.lock:
+            self.calls.clear()
+            self.posted.clear()
+            self.deleted = 0
+            self.connectedAt = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address
+        return f"http://{host}:{port}/api/"
+
+    def start(self, port=0):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                fake._handle(self)
+
+            def do_GET(self):
+                fake._handle(self)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', port), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+
+    # -- request handling ----------------------------------------------------
+
+    def _body(self, req):
+        if req.headers.get('Transfer-Encoding', '').lower() != 'chunked':
+            length = int(req.headers.get('Content-Length') or 0)
+            return req.rfile.read(length) if length else b''
+        # aiohttp streams file uploads chunked
+        chunks = []
+        while True:
+            size = int(req.rfile.readline().split(b';')[0], 16)
+            if size == 0:
+                req.rfile.readline()
+                return b''.join(chunks)
+            chunks.append(req.rfile.read(size))
+            req.rfile.readline()
+
+    def _params(self, req):
+        raw = self._body(req)
+        ctype = req.headers.get('Content-Type', '')
+        # AsyncWebClient sends some methods' arguments in the query string
+        query = req.path.split('?', 1)[1] if '?' in req.path else ''
+        params = {k: v[0] for k, v in parse_qs(query).items()}
+        if 'json' in ctype:
+            params.update(json.loads(raw or b'{}'))
+        elif 'x-www-form-urlencoded' in ctype:
+            params.update({k: v[0] for k, v in parse_qs(raw.decode('utf-8')).items()})
+        return params
+
+    def _send(self, req, status, payload, headers=None):
+        body = json.dumps(payload).encode('utf-8')
+        req.send_response(status)
+        req.send_header('Content-Type', 'application/json')
+        req.send_header('Content-Length', str(len(body)))
+        for key, value in (headers or {}).items():
+            req.send_header(key, value)
+        req.end_headers()
+        req.wfile.write(body)
+
+    def _handle(self, req):
+        if self.latency:
+            time.sleep(self.latency)
+        path = req.path.split('?', 1)[0]
+
+        if path == '/link':
+            self._socket(req)
+            return
+
+        if path.startswith('/upload/'):
+            # Raw file bytes, whatever Content-Type the client claims
+            size = len(self._body(req))
+            with self.lock:
+                self.files[path.rsplit('/', 1)[1]]['size'] = size
+            req.send_response(200)
+            req.send_header('Content-Length', '2')
+            req.end_headers()
+            req.wfile.write(b'OK')
+            return
+
+        params = self._params(req)
+        method = path.rsplit('/', 1)[-1]
+        handler = getattr(self, 'api_' + method.replace('.', '_'), None)
+        if handler is None:
+            result = (200, {'ok': True}, None)
+        else:
+            result = handler(params, req)
+        status, payload, headers = result
+
+        with self.cond:
+            self.calls[method] = self.calls.get(method, 0) + 1
+            self.cond.notify_all()
+        self._send(req, status, payload, headers)
+
+    def _socket(self, req):
+        # RFC 6455 handshake, then one hello frame; reads are drained until
+        # the bot disconnects
+        key = req.headers.get('Sec-WebSocket-Key', '')
+        accept = base64.b64encode(hashlib.sha1(
+            (key + '258EAFA5-E914-47DA-95CA-C5AB0DC85B11').encode()).digest()).decode()
+        req.send_response(101)
+        req.send_header('Upgrade', 'websocket')
+        req.send_header('Connection', 'Upgrade')
+        req.send_header('Sec-WebSocket-Accept', accept)
+        req.end_headers()
+        hello = json.dumps({'type': 'hello', 'num_connections': 1}).encode()
+        req.wfile.write(bytes([0x81, len(hello)]) + hello)
+        req.wfile.flush()
+        with self.cond:
+            self.connectedAt = time.perf_counter()
+            self.calls['socket'] = self.calls.get('socket', 0) + 1
+            self.cond.notify_all()
+        req.close_connection = True
+        try:
+            while req.rfile.read(1):
+                pass
+        except OSError:
+            pass
+
+    def _page(self, items, params):
+        oldest = float(params.get('oldest') or 0)
+        items = [m for m in items if float(m['ts']) >= oldest]
+        offset = int(params.get('cursor') or 0)
+        limit = min(int(params.get('limit') or self.pageSize), self.pageSize)
+        page = items[offset:offset + limit]
+        nxt = str(offset + limit) if offset + limit < len(items) else ''
+        return page, {'next_cursor': nxt}
+
+    # -- Web API methods -------------------------------------------------------
+
+    def api_apps_connections_open(self, params, req):
+        host, port = self.server.server_address
+        return 200, {'ok': True, 'url': f"ws://{host}:{port}/link"}, None
+
+    def api_auth_test(self, params, req):
+        return 200, {'ok': True, 'user_id': 'UBOT', 'bot_id': 'BBOT',
+                     'team_id': 'TBENCH', 'url': 'https://bench.slack.com/'}, None
+
+    def api_conversations_history(self, params, req):
+        with self.lock:
+            msgs = list(reversed(self.messages.get(params.get('channel'), [])))
+        page, meta = self._page(msgs, params)
+        return 200, {'ok': True, 'messages': page,
+                     'has_more': bool(meta['next_cursor']),
+                     'response_metadata': meta}, None
+
+    def api_conversations_replies(self, params, req):
+        with self.lock:
+            msgs = list(self.replies.get((params.get('channel'), params.get('ts')), []))
+        page, meta = self._page(msgs, params)
+        return 200, {'ok': True, 'messages': page,
+                     'has_more': bool(meta['next_cursor']),
+                     'response_metadata': meta}, None
+
+    def api_chat_delete(self, params, req):
+        with self.lock:
+            if self.deleteRate:
+                now = time.monotonic()
+                while self.deleteStamps and now - self.deleteStamps[0] > 1:
+                    self.deleteStamps.popleft()
+                if len(self.deleteStamps) >= self.deleteRate:
+                    return 429, {'ok': False, 'error': 'ratelimited'}, {'Retry-After': '1'}
+                self.deleteStamps.append(now)
+            self.deleted += 1
+        return 200, {'ok': True, 'channel': params.get('channel'), 'ts': params.get('ts')}, None
+
+    def api_chat_postMessage(self, params, req):
+        with self.lock:
+            self.posted.append(params)
+        return 200, {'ok': True, 'channel': params.get('channel'),
+                     'ts': f"{time.time():.6f}", 'message': {'text': params.get('text')}}, None
+
+    def api_chat_postEphemeral(self, params, req):
+        return 200, {'ok': True, 'message_ts': f"{time.time():.6f}"}, None
+
+    def api_views_open(self, params, req):
+        return 200, {'ok': True, 'view': {'id': 'VBENCH'}}, None
+
+    def api_files_getUploadURLExternal(self, params, req):
+        fileID = 'F' + uuid.uuid4().hex[:10].upper()
+        host, port = self.server.server_address
+        with self.lock:
+            self.files[fileID] = {'id': fileID, 'name': params.get('filename'), 'size': 0}
+        return 200, {'ok': True, 'file_id': fileID,
+                     'upload_url': f"http://{host}:{port}/upload/{fileID}"}, None
+
+    def api_files_completeUploadExternal(self, params, req):
+        files = params.get('files')
+        files = json.loads(files) if isinstance(files, str) else files
+        out = []
+        with self.lock:
+            for f in files:
+                entry = self.files.get(f['id'], {'id': f['id']})
+                entry['title'] = f.get('title')
+                entry['permalink'] = f"https://bench.slack.com/files/{f['id']}"
+                out.append({'id': f['id'], 'title': f.get('title')})
+        return 200, {'ok': True, 'files': out}, None
+
+    def api_files_info(self, params, req):
+        with self.lock:
+            entry = self.files.get(params.get('file'))
+        if entry is None:
+            return 200, {'ok': False, 'error': 'file_not_found'}, None
+        return 200, {'ok': True, 'file': entry}, None
@@ -0,0 +1,133 @@
+import json
+import time
+import itertools
+from slack_bolt.request import BoltRequest
+
+
+TEAM = 'TBENCH'
+_seq = itertools.count(1)
+
+
+def _ts():
+    return f"{time.time():.6f}"
+
+
+def messagePayload(text, user='UBENCH', channel='CBENCH'):
+    """
+    Events API envelope for a plain channel message.
+    """
+    n = next(_seq)
+    return {
+        'type': 'event_callback',
+        'team_id': TEAM,
+        'api_app_id': 'ABENCH',
+        'event_id': f"Ev{n:08d}",
+        'event_time': int(time.time()),
+        'event': {
+            'type': 'message',
+            'channel': channel,
+            'channel_type': 'channel',
+            'user': user,
+            'text': text,
+            'ts': _ts(),
+        },
+    }
+
+
+def commandPayload(command, text='', user='UBENCH', channel='CBENCH', responseUrl=''):
+    n = next(_seq)
+    return {
+        'command': command,
+        'text': text,
+        'team_id': TEAM,
+        'api_app_id': 'ABENCH',
+        'channel_id': channel,
+        'user_id': user,
+        'user_name': 'bench',
+        'trigger_id': f"trig.{n}",
+        'response_url': responseUrl,
+    }
+
+
+def actionPayload(actionID, value='', user='UBENCH', channel='CBENCH', responseUrl=''):
+    """
+    block_actions payload for a button click on a bot message.
+    """
+    return {
+        'type': 'block_actions',
+        'team': {'id': TEAM},
+        'api_app_id': 'ABENCH',
+        'user': {'id': user},
+        'channel': {'id': channel},
+        'container': {'type': 'message', 'channel_id': channel, 'message_ts': _ts()},
+        'trigger_id': f"trig.{next(_seq)}",
+        'response_url': responseUrl,
+        'actions': [{
+            'type': 'button',
+            'action_id': actionID,
+            'block_id': 'bench',
+            'value': value,
+            'action_ts': _ts(),
+        }],
+    }
+
+
+def viewPayload(callbackID, values, user='UBENCH', privateMetadata='CBENCH'):
+    """
+    view_submission payload; `values` maps action_id -> selected value.
+    """
+    return {
+        'type': 'view_submission',
+        'team': {'id': TEAM},
+        'api_app_id': 'ABENCH',
+        'user': {'id': user},
+        'trigger_id': f"trig.{next(_seq)}",
+        'view': {
+            'id': 'VBENCH',
+            'type': 'modal',
+            'callback_id': callbackID,
+            'private_metadata': privateMetadata,
+            'state': {'values': {
+                f"block{i}": {actionID: {'type': 'static_select',
+                                         'selected_option': {'value': value}}}
+                for i, (actionID, value) in enumerate(values.items())
+            }},
+        },
+    }
+
+
+def buttonValue(blocks, actionID):
+    """
+    Find the value of button `actionID` in a posted message's blocks, so a
+    replayed click carries exactly what the bot put on the button.
+    """
+    if isinstance(blocks, str):
+        blocks = json.loads(blocks)
+    for block in blocks:
+        for elm in block.get('elements', []) + [block.get('accessory') or {}]:
+            if elm.get('action_id') == actionID:
+                return elm.get('value', '')
+    return None
+
+
+class Replayer:
+    """
+    Feed synthetic payloads straight into a Bolt `app`, the same way the
+    Socket Mode adapter does once an envelope is acked.
+
+    Listeners still run on Bolt's own executor, so `send()` returns once a
+    payload is acked, not once its handler is done; wait on the fake Slack
+    call counters for completion.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.sent = 0
+
+    def send(self, body):
+        self.sent += 1
+        return self.app.dispatch(BoltRequest(body=body, mode='socket_mode'))
+
+    def sendAll(self, bodies):
+        for body in bodies:
+            self.send(body)
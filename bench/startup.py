@@ -0,0 +1,165 @@
+"""
+Benchmark cold start: process launch to Socket Mode connected.
+
+    python bench/startup.py                          # JSON report on stdout
+    python bench/startup.py --runs 10 --save bench/startup.json
+    python bench/startup.py --baseline bench/startup.json --tolerance 0.2
+
+Each run launches a fresh interpreter that imports main.py (or asyncMain.py)
+and calls its main() against a local fake Slack (bench/fakeSlack.py), whose
+apps.connections.open hands out a websocket that stamps the moment the
+handshake completes. Per runtime and startupMode the report holds the median
+of `--runs` runs of:
+
+    import   seconds spent importing the bot module, as seen by the child
+    connect  seconds from launching the process to the websocket handshake
+
+One discarded run per combination comes first, so .pyc files and the asset
+manifest exist, as they would on any restart after the first deploy. With
+--baseline the run exits 1 when any metric is worse than the baseline by
+more than --tolerance.
+"""
+import os
+import sys
+import json
+import shutil
+import signal
+import argparse
+import statistics
+import subprocess
+import threading
+import time
+
+BENCH = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH)
+sys.path.insert(0, ROOT)
+sys.path.insert(0, BENCH)
+
+from fakeSlack import FakeSlack  # noqa: E402
+from benchmark import sandbox, compare  # noqa: E402
+
+
+# Runs in the launched interpreter
+CHILD = """
+import sys, time, json
+start = time.perf_counter()
+if sys.argv[1] == 'async':
+    import asyncio
+    import asyncMain as bot
+else:
+    import main as bot
+print('STARTUP ' + json.dumps({'import': time.perf_counter() - start}), flush=True)
+if sys.argv[1] == 'async':
+    asyncio.run(bot.main())
+else:
+    bot.main()
+"""
+
+# Optional features that would make runs depend on the local .env
+UNSET = ('coordDB', 'cardWarmup', 'metricsPort', 'ink', 'rasterBackend')
+
+
+def childEnv(fake, mode):
+    env = {k: v for k, v in os.environ.items() if k not in UNSET}
+    env.update({
+        'botToken': 'xoxb-bench',
+        'userToken': 'xoxp-bench',
+        'socketToken': 'xapp-bench',
+        'userID': 'UBENCH',
+        'timeRange': '10',
+        'slackApiUrl': fake.url,
+        'startupMode': mode,
+        'PYTHONPATH': ROOT,
+        'PYTHONHASHSEED': '0',
+    })
+    return env
+
+
+def launch(fake, runtime, mode, timeout):
+    """
+    Returns:
+        tuple: (import seconds, launch-to-connected seconds)
+    """
+    fake.reset()
+    imported = {}
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, '-c', CHILD, runtime], env=childEnv(fake, mode),
+        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+        start_new_session=True)
+
+    def read():
+        # Keeps draining after the marker so the bot never blocks on stdout
+        for line in proc.stdout:
+            if line.startswith('STARTUP '):
+                imported.update(json.loads(line[len('STARTUP '):]))
+
+    reader = threading.Thread(target=read, daemon=True)
+    reader.start()
+    try:
+        connectedAt = fake.waitConnected(timeout)
+        if connectedAt is None:
+            raise RuntimeError(f"{runtime}/{mode} did not connect within {timeout}s")
+    finally:
+        # The session also holds the card render workers
+        os.killpg(proc.pid, signal.SIGTERM)
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            os.killpg(proc.pid, signal.SIGKILL)
+            proc.wait()
+        reader.join(timeout=5)
+    return imported.get('import'), connectedAt - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--runtime', choices=('sync', 'async', 'both'), default='both')
+    parser.add_argument('--mode', choices=('lazy', 'eager', 'both'), default='both')
+    parser.add_argument('--timeout', type=float, default=60)
+    parser.add_argument('--save', help="write the report to this JSON file")
+    parser.add_argument('--baseline', help="JSON report to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.2)
+    args = parser.parse_args()
+
+    runtimes = ('sync', 'async') if args.runtime == 'both' else (args.runtime,)
+    modes = ('lazy', 'eager') if args.mode == 'both' else (args.mode,)
+
+    fake = FakeSlack().start()
+    home = os.getcwd()
+    tmp = sandbox()
+    report = {'runs': args.runs}
+    try:
+        for runtime in runtimes:
+            for mode in modes:
+                launch(fake, runtime, mode, args.timeout)
+                samples = [launch(fake, runtime, mode, args.timeout) for _ in range(args.runs)]
+                name = f"{runtime}{mode.capitalize()}"
+                report[f"{name}Import"] = round(statistics.median(s[0] for s in samples), 3)
+                report[f"{name}Connect"] = round(statistics.median(s[1] for s in samples), 3)
+    finally:
+        os.chdir(home)
+        fake.stop()
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    print(json.dumps(report, indent=2))
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        # Every metric here is seconds, lower is better
+        direction = {metric: False for metric in report if metric != 'runs'}
+        regressions = compare(report, baseline, args.tolerance, direction)
+        for line in regressions:
+            print(f"❌ Regression: {line}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print("✅ No regressions against baseline", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
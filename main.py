@@ -1,236 +1,61 @@
-from slack_sdk import WebClient
 from slack_bolt import App
 from slack_bolt.adapter.socket_mode import SocketModeHandler
 import os
-import json
 import re
-import random
+import logging
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
-from subFunctions.chatDelete.delChat import deleteMessage as delChat
-from subFunctions.cardTemp.main import replaceSVGtxt
-from subFunctions.passGen.main import passGen
+from subFunctions.commands.bot import Bot
+from subFunctions.assetRegistry.registry import AssetRegistry
+from subFunctions.procMenu.views import procSelections, procOptions, selectionMessages
+from subFunctions.spoiler.blocks import spoilerTitle, spoilerBlocks, revealBlocks
+from subFunctions.metrics.metrics import commandMetrics, listenerLatency
+from subFunctions.metrics.logs import setupLogging, kv
+from subFunctions.slackClient.clients import getClient, clientMiddleware
 
 
-load_dotenv()
-userToken = os.getenv('userToken')
-botToken = os.getenv('botToken')
-appToken = os.getenv('socketToken')
-userIDs = os.getenv('userID').split(',')
-timeRange = int(os.getenv('timeRange'), 10)
-
-client = WebClient(token=botToken)
-
-with open('proclamations.json', 'r', encoding='utf-8') as j:
-    proc = json.load(j)
-procList = '\n'.join(proc.keys())
-procHeads = []
-for key, val in proc.items():
-    for sKey, sVal in val.items():
-        procHeads.append(sKey)
-
-with open('picPaths.json', 'r') as j:
-    pics = json.load(j)
-picList = '\n'.join(pics.keys())
-
-with open('audPaths.json', 'r') as j:
-    auds = json.load(j)
-audList = '\n'.join(auds.keys())
-
-with open('blankCards.json', 'r', encoding='utf-8') as j:
-    blankCards = json.load(j)
-
-with open('parems.json', 'r', encoding='utf-8') as j:
-    parems = json.load(j)
+# Bolt App runtime. The `--` commands and every service live in Bot
+# (subFunctions/commands/bot.py), shared with asyncMain.py.
 
+load_dotenv()
+setupLogging()
+log = logging.getLogger('chatListener')
 
-meDir = os.path.join('img', 'memes')
+# Shared, rate limited client; also handed to every Bolt listener
+client = getClient(os.getenv('botToken'))
+bot = Bot(client, AssetRegistry)
+bot.router.use(commandMetrics)
+# Runs the effects each command yields, with blocking calls
+bot.router.use(bot.middleware)
+postPool = ThreadPoolExecutor(max_workers=8, thread_name_prefix='post')
 
 
-print(f'BotToken: {botToken}')
-print(f'SocketToken: {appToken}')
-print(f'UserID: {userIDs}')
-# print(f'Commandments: {cmnds}')
-# print(f'Commandments: {auds}')
+log.info("Authorized users: %s", bot.userIDs)
 
 # Initialize the app
-app = App(token=botToken)
-
-
-def slackListView(data: dict, channelID=None):
-    blocks = []
-    for key, val in data.items():
-        keyL = [
-            {"text": {"type": "plain_text", "text": cmd}, "value": cmd}
-            for cmd in list(val.keys())
-        ]
-        elm = {
-            "type": "section",
-            "text": {"type": "mrkdwn", "text": f"*Choose {key}:*"},
-            "accessory": {
-                "type": "static_select",
-                "action_id": f"{key}_select",
-                "placeholder": {"type": "plain_text", "text": f"Select {key}"},
-                "options": keyL
-            }
-        }
-        blocks.append(elm)
-
-    modalView = {
-        "type": "modal",
-        "callback_id": "procHandler",
-        "title": {"type": "plain_text", "text": "Multiple Selections"},
-        "submit": {"type": "plain_text", "text": "Submit"},
-        "close": {"type": "plain_text", "text": "Cancel"},
-        "blocks": blocks
-    }
-
-    # Store the original channel in private_metadata
-    if channelID:
-        modalView["private_metadata"] = channelID
-
-    return modalView
-
-
-def listDir(cmnd):
-    folders = cmnd.split('/')[1:]
-    path = os.path.join(*folders)
-    dirz = '\n'.join(os.listdir(path))
-
-    print(f"User Requested List of directories in '{path}'")
-    return dirz
+# Lazy start leaves auth.test to the first event instead of blocking import
+app = App(client=client, token_verification_enabled=not bot.lazyStart)
+app.use(clientMiddleware(client))
+# Drop chatter, bot and unauthorized messages before listener dispatch
+app.use(bot.messageFilter.middleware)
+if bot.coordinator is not None:
+    # Each event/interaction is handled by the first instance to claim it;
+    # after the filter, so dropped chatter never costs a database write
+    app.use(bot.coordinator.middleware)
 
 
 @app.event("message")
 def messageEvent(body, say, logger):
-    print("\n" + "="*50)
-    print("📩 ANY MESSAGE EVENT RECEIVED!")
-    print("="*50)
-
-    event = body.get('event', {})
-    curUser = event.get('user')
-    text = event.get('text', '')
-    channel = event.get('channel', '')
-    chnlTy = event.get('channel_type')
-    subtype = event.get('subtype')
-    botID = event.get('bot_id')
-
-    # Skip messages without text
-    if not text or not text.startswith('--'):
-        print("📝 Skipping message without text/Command")
-        return
-    # Skip bot messages
-    if ('[bot]' not in text) and (botID or subtype == 'bot_message'):
-        print("🤖 Skipping bot message")
-        return
-    if curUser not in userIDs:
-        print(f"Wrong user (got {curUser}, expected: {userIDs})")
-        say("The Light does not shine upon thee!!!")
-        return
-
-    cmnd = re.search(r"--\S+", text)
-    cmnd = cmnd.group() if cmnd else text
-
-    print(f"✅ Processing message from user: {curUser}")
-
-    print(f"🔍 Event details:")
-    print(f"  - Text: '{text}'")
-    print(f"  - Command: '{cmnd}'")
-    print(f"  - Channel: {channel}")
-
-    # Execute the given trigger
-
-    # Function Triggers
-    if cmnd == "--hookie":
-        print("🧹 Chat delete function called.")
-        delChat(userToken, channel, timeRange)
-        client.files_upload_v2(
-            channel=channel,
-            file=pics['--nuke'],
-            title="I am death, destroyer of both worlds",
-            initial_comment=proc['biblical']['--judgement']
-        )
-
-    # Written Lines Triggers
-    elif cmnd == "--comL":
-        print("User Requested List of Commands")
-        say(f"Here are the list of Commands, MiLord ...\n{procList}")
-    elif cmnd in procHeads:
-        for key, val in proc.items():
-            if cmnd in val:
-                say(val[cmnd])
-
-    # List of sub-directories Trigger
-    elif "--list/" in cmnd:
-        dirz = listDir(cmnd)
-        say(f"Here's the list of sub-directories, MiLord...\n{dirz}")
-
-    # Random Meme request Trigger
-    elif cmnd.startswith("--meme"):
-        path = os.path.join(meDir, *cmnd.split('/')[1:])
-        print(f"Extracted Path: {path}")
-        if not os.path.isdir(path):
-            path = meDir
-        img = random.choice([f for f in os.listdir(path)])
-        imgPath = os.path.join(path, img)
-        print("🖼️ Sending image to Slack channel...")
-        client.files_upload_v2(
-            channel=channel,
-            file=imgPath,
-            title="Here's your meme, MiLord",
-            initial_comment="Behold thy meme!"
-        )
-
-    # List of audio commands request Trigger
-    elif cmnd == '--sayL':
-        print("The Lord has requested the list of audios")
-        say(f"Here's the list MiLord:\n{audList}")
-
-    # Audio command Trigger
-    elif cmnd.startswith('--say'):
-        cmnd = cmnd.split('/')[1:][0]
-        print(f"Audio Command Received: {cmnd}")
-        if cmnd in auds:
-            client.files_upload_v2(
-                channel=channel,
-                file=auds[cmnd],
-                title=f"{cmnd}.mp3",
-                initial_comment="Here's your GOAT'ed words, MiLord ..."
-            )
-        else:
-            say("Invalid Audio Command, MiLord!")
-
-    # Blank Que Game
-    elif cmnd.startswith('--card/'):
-        ty = cmnd.split('/')[1:][0]
-        topTxt = random.choice(blankCards[ty]['blanks'])
-        botTxt = random.choice(blankCards[ty]['fillWords'])
-        maxChars = blankCards[ty]['maxChars']
-        lineHeight = blankCards[ty]['lineHeight']
-        img = blankCards[ty]['cardImg']
-        imgMod = blankCards[ty]['cardImgMod']
-        imgModp = imgMod.replace('.svg', '.png')
-        replaceSVGtxt(img, topTxt, botTxt, imgMod, maxChars, lineHeight)
-        client.files_upload_v2(
-            channel=channel,
-            file=imgModp,
-            title=f"{ty}_Card.svg",
-            initial_comment="Here's your Card, MiLord ..."
-        )
-
-    # Generate random 13-digit pass
-    elif cmnd == '--passGen':
-        password = passGen()
-        say(f"Here's your password, MiLord ...\n{password}")
-
-    # Invalid Command Result
-    else:
+    # Only authorized `--` commands get here, see MessageFilter
+    ctx = bot.commandCtx(body, say)
+    if not bot.router.dispatch(ctx):
+        # Invalid Command Result
         say("Given Command holds no action!")
-        print(f"❌ Trigger not found in text: '{text}'")
-
-    print("="*50 + "\n")
+        log.info("unknown command", extra=kv(cmnd=ctx.cmnd))
 
 
 @app.command("/echo")
+@listenerLatency.time(listener="/echo")
 def repeatText(ack, respond, command, say):
     # Acknowledge command request
     ack()
@@ -240,6 +65,7 @@ def repeatText(ack, respond, command, say):
 
 
 @app.command("/procmenu")
+@listenerLatency.time(listener="/procmenu")
 def handleProcDisplay(ack, body, client):
     # Immediate acknowledgment
     ack()
@@ -247,10 +73,10 @@ def handleProcDisplay(ack, body, client):
     try:
         client.views_open(
             trigger_id=body["trigger_id"],
-            view=slackListView(proc, body["channel_id"])
+            view=bot.procMenuView(body["channel_id"])
         )
     except Exception as e:
-        print(f"Modal error: {e}")
+        log.warning("Modal error: %s", e)
         client.chat_postEphemeral(
             channel=body["channel_id"],
             user=body["user_id"],
@@ -259,11 +85,21 @@ def handleProcDisplay(ack, body, client):
 
 
 @app.action(re.compile(r".*_select"))
+@listenerLatency.time(listener="_select")
 def handleProcAction(ack):
     ack()
 
 
+@app.options(re.compile(r".*_select"))
+@listenerLatency.time(listener="_select options")
+def handleProcOptions(ack, body):
+    # Serves external_select categories too large for static options
+    cfg = bot.config.current()
+    ack(options=procOptions(cfg.proc, body["action_id"], body.get("value", "")))
+
+
 @app.view("procHandler")
+@listenerLatency.time(listener="procHandler")
 def handleProcSubmission(ack, body, view, client):
     ack()
 
@@ -275,38 +111,27 @@ def handleProcSubmission(ack, body, view, client):
     if not ogCh:
         ogCh = body["user"]["id"]
 
-    selections = {}
-
-    # Extract all selections
-    for blockID, blockData in values.items():
-        for actionID, actionData in blockData.items():
-            if actionData.get("selected_option"):
-                # Get the category name (remove "_select" suffix)
-                category = actionID.replace("_select", "")
-                selectedKey = actionData["selected_option"]["value"]
-
-                # Get the actual value from your proc data
-                if category in proc and selectedKey in proc[category]:
-                    selections[category] = {
-                        "key": selectedKey,
-                        "value": proc[category][selectedKey]
-                    }
+    selections = procSelections(values, bot.config.current().proc)
 
     if selections:
-        for category, selection in selections.items():
-            # Post the actual content from your JSON
-            client.chat_postMessage(
-                channel=ogCh,
-                text=f"🎯 {category.title()}: {selection['key']}\n{selection['value']}"
-            )
+        # Post the actual content from your JSON
+        messages = selectionMessages(selections, bot.procBatched)
+        if bot.procBatched:
+            # Usually a single message; overflow parts must stay in order
+            for message in messages:
+                client.chat_postMessage(channel=ogCh, **message)
+        else:
+            list(postPool.map(
+                lambda message: client.chat_postMessage(channel=ogCh, **message), messages))
     else:
         client.chat_postMessage(
             channel=ogCh,
-            text="❌ <@{body['user']['id']}> made no selections!"
+            text=f"❌ <@{body['user']['id']}> made no selections!"
         )
 
 
 @app.command("/spoiler")
+@listenerLatency.time(listener="/spoiler")
 def handleSpoiler(ack, respond, command, client):
     """
     Handle the /spoiler slash command
@@ -318,9 +143,6 @@ def handleSpoiler(ack, respond, command, client):
 
     # Extract the spoiler text from command
     spoilerTxt = command['text'].strip()
-    userId = command['user_id']
-    userName = command['user_name']
-    userEmot = "🫣"
 
     if not spoilerTxt:
         # If no text provided, show error message
@@ -328,52 +150,19 @@ def handleSpoiler(ack, respond, command, client):
             "Please provide text for the spoiler. Usage: `/spoiler {message to be sent}`")
         return
 
-    # Optional: Extract title if provided in brackets
-    if userId in parems['userIds']:
-        userName = parems['userIds'][userId]['name']
-        userEmot = parems['userIds'][userId]['emoji']
-
-    title = f"{userName}: Spoiler Alert! {userEmot}"
-    # Create the spoiler message using Block Kit
-    spoilerBlocks = [
-        {
-            "type": "section",
-            "text": {
-                "type": "mrkdwn",
-                "text": f"*{title}*\n_Invisible, init._"
-            }
-        },
-        {
-            "type": "actions",
-            "elements": [
-                {
-                    "type": "button",
-                    "text": {
-                            "type": "plain_text",
-                            "text": "🔍 Reveal Spoiler"
-                    },
-                    "action_id": "revealSpoiler",
-                    "style": "primary",
-                    # store spoiler text in button value (limited to 2000 chars)
-                    "value": json.dumps({
-                        "spoilerTxt": spoilerTxt,
-                        "title": title,
-                        "revealedBy": []
-                    })
-                }
-            ]
-        }
-    ]
+    title = spoilerTitle(command, bot.config.current().parems)
+    spoilerID = bot.spoilers.add(title, spoilerTxt, command['channel_id'], command['user_id'])
 
     # Post the spoiler message to the channel
     client.chat_postMessage(
         channel=command['channel_id'],
-        blocks=spoilerBlocks,
+        blocks=spoilerBlocks(title, spoilerID),
         text=f"Spoiler: {title}"
     )
 
 
 @app.action("revealSpoiler")
+@listenerLatency.time(listener="revealSpoiler")
 def handleReveal(ack, body, client, respond):
     """
     Handle when user clicks the "Reveal Spoiler" button
@@ -382,54 +171,26 @@ def handleReveal(ack, body, client, respond):
     # Acknowledge the button click
     ack()
 
-    # Extract spoiler data from button value
-    spoilerData = json.loads(body['actions'][0]['value'])
-    spoilerTxt = spoilerData['spoilerTxt']
-    title = spoilerData['title']
+    # The button only carries the spoiler's id
     userId = body['user']['id']
+    spoiler = bot.spoilers.reveal(body['actions'][0]['value'], userId)
+    if spoiler is None:
+        respond(text="⌛ This spoiler has expired, init.",
+                response_type="ephemeral", replace_original=False)
+        return
+    title, spoilerTxt = spoiler
 
     # Send ephemeral message (only visible to the user who clicked)
     client.chat_postEphemeral(
         channel=body['channel']['id'],
         user=userId,
         text=f"Spoiler Revealed: **{title}**",
-        blocks=[
-            {
-                "type": "section",
-                "text": {
-                    "type": "mrkdwn",
-                    "text": f"*🔓 {title}*\n\n{spoilerTxt}"
-                }
-            },
-            {
-                "type": "actions",
-                "elements": [
-                    {
-                        "type": "button",
-                        "text": {
-                            "type": "plain_text",
-                            "text": "🗑️ Delete This"
-                        },
-                        "action_id": "deleteReveal",
-                        "style": "danger",
-                        "value": "deleteSpoilerReveal"
-                    }
-                ]
-            },
-            {
-                "type": "context",
-                "elements": [
-                    {
-                        "type": "mrkdwn",
-                        "text": "_This spoiler only visible to you, init._"
-                    }
-                ]
-            }
-        ]
+        blocks=revealBlocks(title, spoilerTxt)
     )
 
 
 @app.action("deleteReveal")
+@listenerLatency.time(listener="deleteReveal")
 def handledeleteReveal(ack, respond):
     """
     handle deleting the ephemeral spoiler reveal message
@@ -442,12 +203,13 @@ def handledeleteReveal(ack, respond):
         delete_original=True,
         response_type="ephemeral"
     )
-    print(f"🗑️ User deleted their spoiler reveal message")
+    log.debug("🗑️ User deleted their spoiler reveal message")
 
 
 def main():
     print("-"*50)
-    handler = SocketModeHandler(app, appToken)
+    bot.start()
+    handler = SocketModeHandler(app, bot.appToken)
     handler.start()
 
 
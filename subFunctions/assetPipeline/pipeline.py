@@ -0,0 +1,214 @@
+import os
+import json
+import shutil
+import hashlib
+import threading
+import subprocess
+import logging
+import importlib.util
+
+
+log = logging.getLogger(__name__)
+
+
+IMAGE_EXTS = {'.jpg', '.jpeg', '.png', '.webp', '.bmp'}
+AUDIO_EXTS = {'.mp3', '.wav', '.ogg', '.m4a', '.flac'}
+
+
+def fileDigest(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class AssetPipeline:
+    """
+    Build-once, size-optimized variants of the media the bot sends.
+
+    `build()` walks the media folders and, for every file, writes smaller
+    variants next to each other in `outDir`, named after the source's sha256
+    and the variant settings: images are downscaled to `maxDim` and
+    recompressed as WebP / JPEG (needs Pillow), audio is re-encoded as MP3
+    at `audioBitrate` (needs ffmpeg). Whichever tool is missing, those files
+    are simply sent as they are.
+
+    The manifest remembers each file's size, mtime and digest, so a rebuild
+    only hashes files that changed and only encodes content it has not seen
+    with the same settings. `best(path)` is what the send paths call: the
+    smallest variant of an unchanged file, else the file itself.
+
+    Args:
+        roots (list): Media folders to scan
+        outDir (str): Where variants and the manifest live (default: 'cache/variants')
+        maxDim (int): Longest image side after downscaling (default: 1280)
+        quality (int): WebP / JPEG quality (default: 80)
+        audioBitrate (str): ffmpeg MP3 bitrate (default: '96k')
+    """
+
+    def __init__(self, roots, outDir=os.path.join('cache', 'variants'),
+                 maxDim=1280, quality=80, audioBitrate='96k'):
+        self.roots = list(roots)
+        self.outDir = outDir
+        self.manifestPath = os.path.join(outDir, 'manifest.json')
+        self.maxDim = maxDim
+        self.quality = quality
+        self.audioBitrate = audioBitrate
+        self.ffmpeg = shutil.which('ffmpeg')
+        # Variants made with other settings (or tools) are not reused
+        # Found without importing Pillow, which only the build thread needs
+        hasPillow = importlib.util.find_spec('PIL') is not None
+        settings = json.dumps([maxDim, quality, audioBitrate, hasPillow, bool(self.ffmpeg)])
+        self.spec = hashlib.sha256(settings.encode()).hexdigest()[:8]
+        self.lock = threading.Lock()
+        self.buildLock = threading.Lock()
+        self.files = {}
+        self.variants = {}
+        if os.path.exists(self.manifestPath):
+            with open(self.manifestPath, 'r', encoding='utf-8') as j:
+                manifest = json.load(j)
+            self.files = manifest.get('files', {})
+            self.variants = manifest.get('variants', {})
+
+    def _save(self):
+        os.makedirs(self.outDir, exist_ok=True)
+        # Per-process name: instances sharing cache/ may build at once
+        tmp = f"{self.manifestPath}.{os.getpid()}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as j:
+            json.dump({'files': self.files, 'variants': self.variants}, j, indent=4)
+        os.replace(tmp, self.manifestPath)
+
+    def _scan(self):
+        for root in self.roots:
+            for folder, _, names in os.walk(root):
+                for name in sorted(names):
+                    ext = os.path.splitext(name)[1].lower()
+                    if ext in IMAGE_EXTS or ext in AUDIO_EXTS:
+                        yield os.path.normpath(os.path.join(folder, name)), ext
+
+    def _imageVariants(self, path, base):
+        try:
+            from PIL import Image
+        except ImportError:
+            return []
+        made = []
+        with Image.open(path) as img:
+            if getattr(img, 'is_animated', False):
+                # Flattening would lose the animation
+                return []
+            img.thumbnail((self.maxDim, self.maxDim))
+            hasAlpha = img.mode in ('RGBA', 'LA') or 'transparency' in img.info
+            webp = f"{base}.webp"
+            img.save(webp, 'WEBP', quality=self.quality, method=6)
+            made.append(webp)
+            if not hasAlpha:
+                jpeg = f"{base}.jpg"
+                img.convert('RGB').save(jpeg, 'JPEG', quality=self.quality,
+                                        optimize=True, progressive=True)
+                made.append(jpeg)
+        return made
+
+    def _audioVariants(self, path, base):
+        if self.ffmpeg is None:
+            return []
+        mp3 = f"{base}.mp3"
+        subprocess.run(
+            [self.ffmpeg, '-y', '-v', 'error', '-i', path, '-vn',
+             '-codec:a', 'libmp3lame', '-b:a', self.audioBitrate, mp3],
+            check=True, capture_output=True, timeout=300)
+        return [mp3]
+
+    def _encode(self, path, ext, digest):
+        """
+        Returns:
+            list: Variants smaller than the source, smallest first
+        """
+        os.makedirs(self.outDir, exist_ok=True)
+        base = os.path.join(self.outDir, f"{digest[:32]}-{self.spec}")
+        try:
+            if ext in IMAGE_EXTS:
+                made = self._imageVariants(path, base)
+            else:
+                made = self._audioVariants(path, base)
+        except Exception as e:
+            log.warning("⚠️ Could not optimize %s: %s", path, e)
+            return []
+
+        size = os.path.getsize(path)
+        variants = []
+        for variant in made:
+            vSize = os.path.getsize(variant)
+            if vSize < size:
+                variants.append({'path': variant, 'bytes': vSize})
+            else:
+                os.remove(variant)
+        return sorted(variants, key=lambda v: v['bytes'])
+
+    def build(self):
+        """
+        Bring the variants up to date with the media folders.
+
+        Returns:
+            int: Number of files that had to be (re-)encoded
+        """
+        with self.buildLock:
+            files, variants = {}, {}
+            encoded = 0
+            for path, ext in self._scan():
+                st = os.stat(path)
+                old = self.files.get(path)
+                if old and old['size'] == st.st_size and old['mtime'] == st.st_mtime_ns:
+                    digest = old['digest']
+                else:
+                    digest = fileDigest(path)
+                key = f"{digest}-{self.spec}"
+                files[path] = {'size': st.st_size, 'mtime': st.st_mtime_ns,
+                               'digest': digest, 'variant': key}
+                if key in variants:
+                    continue
+                known = self.variants.get(key)
+                if known is not None and all(os.path.exists(v['path']) for v in known):
+                    variants[key] = known
+                else:
+                    variants[key] = self._encode(path, ext, digest)
+                    encoded += 1
+
+            # Variants no file points at any more are dead weight
+            keep = {v['path'] for vs in variants.values() for v in vs}
+            for vs in self.variants.values():
+                for v in vs:
+                    if v['path'] not in keep and os.path.exists(v['path']):
+                        os.remove(v['path'])
+
+            with self.lock:
+                self.files, self.variants = files, variants
+                self._save()
+        saved = sum(files[p]['size'] - variants[f['variant']][0]['bytes']
+                    for p, f in files.items() if variants[f['variant']])
+        log.info("🗜️ Asset pipeline: %d files, %d encoded, %.0f KB saved per full send",
+                 len(files), encoded, saved / 1024)
+        return encoded
+
+    def start(self):
+        threading.Thread(target=self.build, name='asset-pipeline', daemon=True).start()
+
+    def best(self, path):
+        """
+        The smallest variant of `path`, or `path` itself when it has none
+        or changed since the last build.
+        """
+        key = os.path.normpath(path)
+        with self.lock:
+            entry = self.files.get(key)
+            variants = self.variants.get(entry['variant'], []) if entry else []
+        if not variants:
+            return path
+        try:
+            st = os.stat(path)
+        except OSError:
+            return path
+        if (st.st_size, st.st_mtime_ns) != (entry['size'], entry['mtime']):
+            return path
+        best = variants[0]['path']
+        return best if os.path.exists(best) else path
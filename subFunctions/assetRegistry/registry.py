@@ -0,0 +1,186 @@
+import os
+import json
+import time
+import hashlib
+import tempfile
+import threading
+import logging
+from collections import namedtuple
+from slack_sdk.errors import SlackApiError
+from subFunctions.commands.effects import Offload, drive, adrive
+
+
+log = logging.getLogger(__name__)
+
+# Call one Slack Web API method, e.g. Call('files_info', {'file': id})
+Call = namedtuple('Call', 'method kwargs')
+
+
+class AssetRegistry:
+    """
+    Persistent map from a channel and a local file's content hash to the
+    Slack file it was already uploaded as there.
+
+    Repeat sends of a static asset (the --hookie nuke, --say audio ...) post
+    the existing file's permalink instead of pushing the bytes through the
+    three-step files_upload_v2 flow again. The remote copy is re-checked
+    with files.info at most every `verifyTTL` seconds, and the file is
+    uploaded again only when its content changed or Slack lost it. Entries
+    are per channel: a permalink only renders for members of a channel the
+    file was shared in, so another channel gets its own upload.
+
+    Args:
+        client: Slack WebClient (any client with the same methods works)
+        path (str): JSON file the registry is persisted to
+        verifyTTL (float): Seconds a successful files.info check stays valid
+        pipeline (AssetPipeline): Sends its smallest variant of each file (optional)
+    """
+
+    def __init__(self, client, path=os.path.join('cache', 'assets.json'), verifyTTL=3600,
+                 pipeline=None):
+        self.client = client
+        self.pipeline = pipeline
+        self.path = path
+        self.verifyTTL = verifyTTL
+        self.lock = threading.Lock()
+        self.hashes = {}
+        self.entries = {}
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as j:
+                # Entries from before channel scoping are keyed by digest alone
+                self.entries = {k: v for k, v in json.load(j).items() if ':' in k}
+
+    def _save(self):
+        folder = os.path.dirname(self.path) or '.'
+        os.makedirs(folder, exist_ok=True)
+        with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=folder,
+                                         suffix='.tmp', delete=False) as j:
+            json.dump(self.entries, j, indent=4)
+        os.replace(j.name, self.path)
+
+    @staticmethod
+    def key(channel, digest):
+        return f"{channel}:{digest}"
+
+    def variant(self, file):
+        """
+        Returns:
+            tuple: (path to send, upload filename) - the pipeline's smallest
+                variant under the original name with the variant's extension
+        """
+        path = self.pipeline.best(file) if self.pipeline else file
+        stem = os.path.splitext(os.path.basename(file))[0]
+        return path, stem + os.path.splitext(path)[1]
+
+    def digest(self, file):
+        """
+        sha256 of the file, recomputed only when its size or mtime changed.
+        """
+        st = os.stat(file)
+        stamp = (st.st_size, st.st_mtime_ns)
+        cached = self.hashes.get(file)
+        if cached and cached[0] == stamp:
+            return cached[1]
+
+        h = hashlib.sha256()
+        with open(file, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                h.update(chunk)
+        digest = h.hexdigest()
+        self.hashes[file] = (stamp, digest)
+        return digest
+
+    # The send logic is a generator of effects (see commands/effects.py),
+    # so the sync and async registries differ only in how they perform them
+
+    def _alive(self, entry):
+        if time.time() - entry.get('verified', 0) < self.verifyTTL:
+            return True
+        try:
+            info = yield Call('files_info', {'file': entry['id']})
+        except SlackApiError as e:
+            log.info("♻️ Cached asset %s is gone (%s)", entry['id'], e.response['error'])
+            return False
+        entry['permalink'] = info['file'].get('permalink', entry.get('permalink'))
+        entry['verified'] = time.time()
+        return True
+
+    def _upload(self, channel, path, filename, title, initial_comment):
+        response = yield Call('files_upload_v2', {
+            'channel': channel,
+            'file': path,
+            'filename': filename,
+            'title': title,
+            'initial_comment': initial_comment
+        })
+        uploaded = response.get('file') or response['files'][0]
+        permalink = uploaded.get('permalink')
+        if not permalink:
+            # completeUploadExternal does not always echo the permalink
+            try:
+                info = yield Call('files_info', {'file': uploaded['id']})
+                permalink = info['file']['permalink']
+            except SlackApiError as e:
+                log.warning("⚠️ No permalink for %s, not caching it: %s", path, e.response['error'])
+                return None
+        return {'id': uploaded['id'], 'permalink': permalink,
+                'file': path, 'verified': time.time()}
+
+    def _send(self, channel, file, title, initial_comment):
+        path, filename = self.variant(file)
+        digest = yield Offload(self.digest, (path,))
+        with self.lock:
+            entry = self.entries.get(self.key(channel, digest))
+
+        if entry and (yield from self._alive(entry)):
+            yield Call('chat_postMessage', {
+                'channel': channel,
+                'text': f"{initial_comment}\n<{entry['permalink']}|{title}>",
+                'unfurl_media': True
+            })
+            log.debug("🔗 Shared cached asset %s (%s)", path, entry['id'])
+            return True
+
+        entry = yield from self._upload(channel, path, filename, title, initial_comment)
+        if entry is None:
+            return False
+        with self.lock:
+            self.entries[self.key(channel, digest)] = entry
+            self._save()
+        log.info("📤 Uploaded asset %s (%s)", path, entry['id'])
+        return False
+
+    def perform(self, effect):
+        if isinstance(effect, Call):
+            return getattr(self.client, effect.method)(**effect.kwargs)
+        if isinstance(effect, Offload):
+            return effect.fn(*effect.args)
+        raise TypeError(f"Unknown effect {effect!r}")
+
+    def send(self, channel, file, title, initial_comment=''):
+        """
+        Send a local file to `channel`, by reference when Slack already has it.
+
+        Returns:
+            bool: True if the file was shared by reference, False if uploaded
+        """
+        return drive(self._send(channel, file, title, initial_comment), self.perform)
+
+
+class AsyncAssetRegistry(AssetRegistry):
+    """
+    AssetRegistry driven by an AsyncWebClient for the asyncio runtime.
+    File hashing runs in the default executor so the event loop never
+    blocks on disk reads.
+    """
+
+    async def aperform(self, effect):
+        import asyncio
+        if isinstance(effect, Call):
+            return await getattr(self.client, effect.method)(**effect.kwargs)
+        if isinstance(effect, Offload):
+            return await asyncio.to_thread(effect.fn, *effect.args)
+        raise TypeError(f"Unknown effect {effect!r}")
+
+    async def send(self, channel, file, title, initial_comment=''):
+        return await adrive(self._send(channel, file, title, initial_comment), self.aperform)
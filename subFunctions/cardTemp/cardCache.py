@@ -0,0 +1,100 @@
+import os
+import json
+import hashlib
+import threading
+import logging
+from collections import OrderedDict
+
+
+log = logging.getLogger(__name__)
+
+
+class CardCache:
+    """
+    Disk-backed cache of rendered card PNGs with size-bounded LRU eviction.
+
+    Files are named by a hash of everything that affects the render (template
+    path and mtime, both texts, maxChars, lineHeight), so a hit is a plain
+    file lookup. Recency is tracked in memory and mirrored to file mtimes, so
+    the LRU order survives restarts.
+
+    Args:
+        cacheDir (str): Directory holding the cached PNGs (default: 'cache/cards')
+        maxBytes (int): Total size allowed before evicting (default: 200 MB)
+    """
+
+    def __init__(self, cacheDir=os.path.join('cache', 'cards'), maxBytes=200 * 1024**2):
+        self.cacheDir = cacheDir
+        self.maxBytes = maxBytes
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(cacheDir, exist_ok=True)
+        files = []
+        for name in os.listdir(cacheDir):
+            if name.endswith('.png'):
+                st = os.stat(os.path.join(cacheDir, name))
+                files.append((st.st_mtime, name[:-4], st.st_size))
+        for _, key, size in sorted(files):
+            self.entries[key] = size
+            self.size += size
+
+    @staticmethod
+    def key(template, topTxt, botTxt, maxChars, lineHeight):
+        mtime = os.stat(template).st_mtime_ns
+        blob = json.dumps([template, mtime, topTxt, botTxt, maxChars, lineHeight])
+        return hashlib.sha256(blob.encode('utf-8')).hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.cacheDir, f"{key}.png")
+
+    def get(self, key):
+        """
+        Returns:
+            bytes: The cached PNG, or None on a miss
+        """
+        with self.lock:
+            if key not in self.entries:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+        path = self.path(key)
+        try:
+            with open(path, 'rb') as f:
+                pngBytes = f.read()
+            os.utime(path)
+        except FileNotFoundError:
+            with self.lock:
+                self.size -= self.entries.pop(key, 0)
+            return None
+        return pngBytes
+
+    def put(self, key, pngBytes):
+        """
+        Store a freshly rendered PNG and evict old entries.
+        """
+        path = self.path(key)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, 'wb') as f:
+            f.write(pngBytes)
+        os.replace(tmp, path)
+        size = len(pngBytes)
+
+        with self.lock:
+            self.size += size - self.entries.pop(key, 0)
+            self.entries[key] = size
+            victims = []
+            while self.size > self.maxBytes and len(self.entries) > 1:
+                oldKey, oldSize = self.entries.popitem(last=False)
+                self.size -= oldSize
+                victims.append(oldKey)
+
+        for oldKey in victims:
+            try:
+                os.remove(self.path(oldKey))
+            except FileNotFoundError:
+                pass
@@ -1,8 +1,13 @@
 from bs4 import BeautifulSoup
+import logging
 import textwrap
-import subprocess
-import os
-from dotenv import load_dotenv
+from subFunctions.cardTemp.rasterizer import getRasterizer
+from subFunctions.cardTemp.templateCache import getTemplate
+from subFunctions.cardTemp.cardCache import CardCache
+from subFunctions.metrics.metrics import renderLatency
+
+
+log = logging.getLogger(__name__)
 
 
 def wrapText(txtElm, newTxt, soup, maxChars=30, lineHeight=2.0):
@@ -60,18 +65,20 @@ def wrapText(txtElm, newTxt, soup, maxChars=30, lineHeight=2.0):
 
 def getSVGdims(svgCon):
     soup = BeautifulSoup(svgCon, 'xml')
-    svgElm = soup.find('svg')
+    return svgDims(soup.find('svg'))
+
 
+def svgDims(svgElm):
     if not svgElm:
-        print("WARNING: No SVG element found, using default 1920x1080")
+        log.warning("No SVG element found, using default 1920x1080")
         return 1920, 1080
 
-    print("SCG attributes:", dict(svgElm.attrs))
+    log.debug("SVG attributes: %s", dict(svgElm.attrs))
 
     width = svgElm.get('width')
     height = svgElm.get('height')
     viewBox = svgElm.get('viewBox')
-    print(f"Width: {width}\nHeight: {height}\nViewBox: {viewBox}")
+    log.debug("Width: %s Height: %s ViewBox: %s", width, height, viewBox)
 
     if viewBox:
         parts = viewBox.split()
@@ -98,41 +105,30 @@ def svgToPng(svgCon, svgFile, pngFile, width=None, height=None, quality=95):
         width = width or svgWidth
         height = height or svgHeight
 
-    load_dotenv()
-    ink = os.getenv('ink')
-    cmd = [ink, '--export-filename', pngFile]
-    if width and height:
-        cmd.extend(['--export-width', str(width),
-                   '--export-height', str(height)])
-
-    cmd.append(svgFile)
-    # print(f"cmd line:\n{cmd}")
+    # Rendered by a long-lived backend instead of a fresh Inkscape per card
+    pngBytes = getRasterizer().render(svgCon, width, height)
+    with open(pngFile, 'wb') as f:
+        f.write(pngBytes)
+    log.debug("✓ Converted: %s", pngFile)
 
-    subprocess.run(cmd)
-    print(f"✓ Converted: {pngFile}")
 
-
-def replaceSVGtxt(svgFileIn: str, topTxt: str, botTxt: str, svgFile='modifiedImg.svg', maxChar=30, lineHeight=2.0):
+def fillSVG(svgFileIn: str, topTxt: str, botTxt: str, maxChar=30, lineHeight=2.0):
     """
-    Replaces text in an SVG file with new text that automatically wraps to multiple lines.
+    Fill the text slots of a card template, entirely in memory.
 
     Args:
-        svgFileIn (str): Path to the input SVG file
+        svgFileIn (str): Path to the input SVG template
         topTxt (str): New text for the top text element (will be wrapped if too long)
         botTxt (str): New text for the bottom text element (will be wrapped if too long)
-        saveFile (str): Path for the output SVG file (default: 'modifiedImg.svg')
 
     Returns:
-        None: Creates a new SVG file with replaced text
+        tuple: (SVG markup, (width, height))
     """
 
-    # Load SVG
-    with open(svgFileIn, 'r', encoding='utf-8') as f:
-        soup = BeautifulSoup(f.read(), 'xml')
-
-    # Find all text elements
-    txtElms = soup.find_all(['text', 'tspan'])
-    txtElms = [elm for elm in txtElms if elm.get_text(strip=True)]
+    # Parsed template (and its text slots) cached per path and mtime
+    template = getTemplate(svgFileIn, svgDims)
+    soup = template.soup
+    root, txtElms = template.clone()
 
     # print(f"Found {len(txtElms)} text elements")
 
@@ -146,21 +142,74 @@ def replaceSVGtxt(svgFileIn: str, topTxt: str, botTxt: str, svgFile='modifiedImg
         wrapText(txtElms[0], topTxt, soup, maxChar, lineHeight)
         # print(f"Replace Top Text:\n{oldTop}\nwith\n{topTxt}")
 
-    if len(txtElms) >= 2:
+    if len(txtElms) >= 3:
         oldBot = txtElms[2].get_text(strip=True)
         wrapText(txtElms[2], botTxt, soup, maxChar, lineHeight)
         # print(f"Replace Bottom Text:\n{oldBot}\nwith\n{botTxt}")
 
+    return template.prolog + str(root), template.dims
+
+
+def replaceSVGtxt(svgFileIn: str, topTxt: str, botTxt: str, svgFile='modifiedImg.svg', maxChar=30, lineHeight=2.0):
+    """
+    Replaces text in an SVG file with new text that automatically wraps to multiple lines.
+
+    Args:
+        svgFileIn (str): Path to the input SVG file
+        topTxt (str): New text for the top text element (will be wrapped if too long)
+        botTxt (str): New text for the bottom text element (will be wrapped if too long)
+        saveFile (str): Path for the output SVG file (default: 'modifiedImg.svg')
+
+    Returns:
+        None: Creates a new SVG file with replaced text
+    """
+    svgCon, (width, height) = fillSVG(
+        svgFileIn, topTxt, botTxt, maxChar, lineHeight)
+
     # Save modified SVG
     with open(svgFile, 'w', encoding='utf-8') as f:
-        f.write(str(soup))
+        f.write(svgCon)
 
     # print(f"✓ Saved: {svgFile}")
 
     baseName = svgFile.replace('.svg', '.png')
-    svgCon = str(soup)
     pngFile = baseName
-    svgToPng(svgCon, svgFile, pngFile)
+    svgToPng(svgCon, svgFile, pngFile, width, height)
+
+
+def renderCard(card: dict, topTxt: str, botTxt: str, cache: CardCache = None):
+    """
+    Render one card to PNG bytes, reusing a cached render when the same card
+    was made before. Nothing is written to shared scratch files, so
+    concurrent requests can never swap each other's cards.
+
+    Args:
+        card (dict): One card type from blankCards.json
+        topTxt (str): Text for the top slot
+        botTxt (str): Text for the bottom slot
+        cache (CardCache): Rendered-card cache (default: no caching)
+
+    Returns:
+        bytes: The rendered PNG
+    """
+    maxChars = card['maxChars']
+    lineHeight = card['lineHeight']
+    img = card['cardImg']
+
+    if cache:
+        key = cache.key(img, topTxt, botTxt, maxChars, lineHeight)
+        hit = cache.get(key)
+        if hit:
+            log.debug("⚡ Card cache hit")
+            return hit
+
+    with renderLatency.time(stage='fill'):
+        svgCon, (width, height) = fillSVG(img, topTxt, botTxt, maxChars, lineHeight)
+    with renderLatency.time(stage='rasterize'):
+        pngBytes = getRasterizer().render(svgCon, width, height)
+    if cache:
+        cache.put(key, pngBytes)
+    return pngBytes
 
 
 if __name__ == '__main__':
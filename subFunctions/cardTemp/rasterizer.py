@@ -0,0 +1,177 @@
+import os
+import atexit
+import threading
+import tempfile
+import subprocess
+import logging
+from dotenv import load_dotenv
+
+try:
+    import cairosvg
+except ImportError:
+    cairosvg = None
+
+
+log = logging.getLogger(__name__)
+
+
+class InkscapeShell:
+    """
+    A long-lived `inkscape --shell` process fed export jobs over its stdin.
+
+    Inkscape prints a '> ' prompt once it has finished each command line, so
+    a job is done when the prompt comes back. If the process dies (or hangs
+    past `timeout`) it is killed and started again on the next job.
+
+    Args:
+        ink (str): Path to the Inkscape executable
+        timeout (float): Seconds to wait for a single export (default: 60)
+    """
+
+    PROMPT = '> '
+
+    def __init__(self, ink, timeout=60):
+        self.ink = ink
+        self.timeout = timeout
+        self.proc = None
+        self.buffer = ''
+        # Set by the reader at EOF: the process is gone even if not yet reaped
+        self.dead = False
+        self.cond = threading.Condition()
+        self.lock = threading.Lock()
+
+    def _start(self):
+        with self.cond:
+            self.proc = subprocess.Popen(
+                [self.ink, '--shell'],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                bufsize=0
+            )
+            self.buffer = ''
+            self.dead = False
+        threading.Thread(
+            target=self._reader, args=(self.proc,), daemon=True).start()
+        self._waitPrompt()
+        log.info("🖌️ Inkscape shell started")
+
+    def _reader(self, proc):
+        while True:
+            chunk = proc.stdout.read(1)
+            with self.cond:
+                if proc is not self.proc:
+                    return
+                if not chunk:
+                    self.dead = True
+                    self.cond.notify_all()
+                    return
+                self.buffer += chunk
+                self.cond.notify_all()
+
+    def _waitPrompt(self):
+        with self.cond:
+            ok = self.cond.wait_for(
+                lambda: self.buffer.endswith(self.PROMPT) or self.dead,
+                timeout=self.timeout
+            )
+            output, self.buffer = self.buffer, ''
+            dead = self.dead
+        if not ok or dead:
+            raise RuntimeError(f"Inkscape shell stopped responding: {output[-200:]}")
+        return output
+
+    def alive(self):
+        return self.proc is not None and not self.dead and self.proc.poll() is None
+
+    def close(self):
+        if self.alive():
+            try:
+                self.proc.stdin.write('quit\n')
+                self.proc.wait(timeout=5)
+            except Exception:
+                self.proc.kill()
+        self.proc = None
+
+    def render(self, svgCon, width=None, height=None):
+        """
+        Rasterize SVG markup to PNG bytes.
+
+        Inkscape's shell only reads and writes files, so each job gets its
+        own private temp directory; nothing is shared between requests.
+        """
+        with tempfile.TemporaryDirectory(prefix='card-') as tmp:
+            svgFile = os.path.join(tmp, 'card.svg')
+            pngFile = os.path.join(tmp, 'card.png')
+            with open(svgFile, 'w', encoding='utf-8') as f:
+                f.write(svgCon)
+            self.export(svgFile, pngFile, width, height)
+            with open(pngFile, 'rb') as f:
+                return f.read()
+
+    def export(self, svgFile, pngFile, width=None, height=None):
+        actions = [f'file-open:{os.path.abspath(svgFile)}',
+                   f'export-filename:{os.path.abspath(pngFile)}']
+        if width and height:
+            actions += [f'export-width:{width}', f'export-height:{height}']
+        actions += ['export-do', 'file-close']
+        line = '; '.join(actions) + '\n'
+
+        with self.lock:
+            for attempt in range(2):
+                try:
+                    if not self.alive():
+                        self._start()
+                    self.proc.stdin.write(line)
+                    self._waitPrompt()
+                    return
+                except (OSError, RuntimeError) as e:
+                    log.warning("⚠️ Inkscape shell crashed (%s), restarting ...", e)
+                    if self.proc is not None:
+                        self.proc.kill()
+                    self.proc = None
+                    if attempt:
+                        raise
+
+
+class CairoRasterizer:
+    """
+    In-process rasterizer backed by cairosvg, no external process at all.
+    """
+
+    def render(self, svgCon, width=None, height=None):
+        return cairosvg.svg2png(
+            bytestring=svgCon.encode('utf-8'),
+            output_width=width, output_height=height
+        )
+
+    def close(self):
+        pass
+
+
+_rasterizer = None
+_rasterLock = threading.Lock()
+
+
+def getRasterizer():
+    """
+    Return the process-wide rasterizer, creating it on first use.
+
+    The backend comes from the `rasterBackend` env var ('inkscape' or
+    'cairo'); by default Inkscape is used when `ink` is set, else cairosvg.
+    """
+    global _rasterizer
+    with _rasterLock:
+        if _rasterizer is None:
+            load_dotenv()
+            ink = os.getenv('ink')
+            backend = os.getenv('rasterBackend') or ('inkscape' if ink else 'cairo')
+            if backend == 'cairo':
+                if cairosvg is None:
+                    raise RuntimeError("rasterBackend=cairo needs cairosvg installed")
+                _rasterizer = CairoRasterizer()
+            else:
+                _rasterizer = InkscapeShell(ink)
+            atexit.register(_rasterizer.close)
+        return _rasterizer
@@ -0,0 +1,284 @@
+import os
+import time
+import logging
+import threading
+import multiprocessing
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from subFunctions.metrics.metrics import (
+    renderLatency, cardQueueDepth, cardQueueWait, cardRejected)
+
+
+log = logging.getLogger(__name__)
+
+# Seconds a caller waits for one card before giving up on it
+RENDER_TIMEOUT = 60
+
+
+class CardBusy(Exception):
+    """
+    Raised by CardRenderer.submit when the render queue is full.
+    """
+
+
+def preloadWorker():
+    # Runs in each fresh worker, so the bot itself never imports bs4 for cards
+    import subFunctions.cardTemp.main  # noqa: F401
+
+
+def renderJob(card, topTxt, botTxt):
+    """
+    Fill and rasterize one card inside a pool worker.
+
+    Metrics recorded in a worker would stay there, so the stage timings are
+    handed back with the PNG and observed by the parent.
+
+    Returns:
+        tuple: (PNG bytes, fill seconds, rasterize seconds)
+    """
+    from subFunctions.cardTemp.main import fillSVG
+    from subFunctions.cardTemp.rasterizer import getRasterizer
+    start = time.perf_counter()
+    svgCon, (width, height) = fillSVG(
+        card['cardImg'], topTxt, botTxt, card['maxChars'], card['lineHeight'])
+    filled = time.perf_counter()
+    pngBytes = getRasterizer().render(svgCon, width, height)
+    return pngBytes, filled - start, time.perf_counter() - filled
+
+
+class CardRenderer:
+    """
+    Renders cards on a process pool so a burst of `--card/` requests uses
+    every core instead of queueing behind the GIL on the handler threads.
+
+    At most `maxQueue` renders are waiting or running at once; past that
+    `submit` raises CardBusy right away, so callers can answer "busy" instead
+    of piling up latency. A card type with `maxConcurrent` in blankCards.json
+    never occupies more than that many workers; its extra requests wait
+    (inside the same queue bound) until one of its renders finishes.
+
+    Args:
+        workers (int): Worker processes (default: one per core)
+        maxQueue (int): Renders waiting or running before CardBusy (default: 4 per worker)
+        cache (CardCache): Rendered-card cache, checked before queueing (default: none)
+    """
+
+    def __init__(self, workers=None, maxQueue=None, cache=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.maxQueue = maxQueue or 4 * self.workers
+        self.cache = cache
+        self.pool = None
+        self.poolLock = threading.Lock()
+        self.queued = 0
+        self.running = {}
+        self.waiting = {}
+        self.lock = threading.Lock()
+
+    def _pool(self):
+        with self.poolLock:
+            if self.pool is None:
+                # Forked, since spawned workers would re-run the bot's __main__
+                method = 'fork' if 'fork' in multiprocessing.get_all_start_methods() else 'spawn'
+                self.pool = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context(method),
+                    initializer=preloadWorker)
+            return self.pool
+
+    def _discard(self, pool):
+        """
+        Drop `pool` after one of its workers died; ProcessPoolExecutor never
+        recovers from that, so the next render builds a fresh pool.
+        """
+        with self.poolLock:
+            if self.pool is not pool:
+                return
+            self.pool = None
+        log.warning("💥 Card render worker died, restarting the pool")
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def start(self):
+        """
+        Fork every worker now. Call before the bot starts its own threads,
+        so no worker inherits a lock some other thread was holding. Does not
+        wait for the workers to finish their imports.
+        """
+        self._pool().submit(os.getpid)
+
+    def submit(self, ty, card, topTxt, botTxt):
+        """
+        Queue one render.
+
+        Returns:
+            Future: Resolves to the PNG bytes
+
+        Raises:
+            CardBusy: The queue is full
+        """
+        result = Future()
+        key = None
+        if self.cache:
+            key = self.cache.key(card['cardImg'], topTxt, botTxt,
+                                 card['maxChars'], card['lineHeight'])
+            hit = self.cache.get(key)
+            if hit:
+                log.debug("⚡ Card cache hit")
+                result.set_result(hit)
+                return result
+
+        job = (ty, card, topTxt, botTxt, key, result, time.perf_counter())
+        with self.lock:
+            if self.queued >= self.maxQueue:
+                cardRejected.inc(type=ty)
+                raise CardBusy(f"{self.queued} cards already queued")
+            self.queued += 1
+            cardQueueDepth.set(self.queued)
+            cap = card.get('maxConcurrent')
+            if cap and self.running.get(ty, 0) >= cap:
+                self.waiting.setdefault(ty, deque()).append(job)
+                return result
+            self.running[ty] = self.running.get(ty, 0) + 1
+        self._start(job)
+        return result
+
+    def render(self, ty, card, topTxt, botTxt, timeout=RENDER_TIMEOUT):
+        """
+        Blocking submit(): the PNG bytes of one card.
+
+        Raises:
+            CardBusy: The queue is full
+            TimeoutError: No PNG within `timeout` seconds
+        """
+        return self.submit(ty, card, topTxt, botTxt).result(timeout)
+
+    def _start(self, job):
+        ty, card, topTxt, botTxt, key, result, queuedAt = job
+        cardQueueWait.observe(time.perf_counter() - queuedAt, type=ty)
+        future = error = None
+        for _ in range(2):
+            pool = self._pool()
+            try:
+                future = pool.submit(renderJob, card, topTxt, botTxt)
+                break
+            except BrokenProcessPool as e:
+                # A worker died since the last render; retry on a fresh pool
+                self._discard(pool)
+                error = e
+            except Exception as e:
+                error = e
+                break
+        if future is None:
+            self._finish(ty)
+            result.set_exception(error)
+            return
+        future.add_done_callback(lambda f: self._done(job, pool, f))
+
+    def _done(self, job, pool, future):
+        ty, card, topTxt, botTxt, key, result, queuedAt = job
+        try:
+            pngBytes, fillTime, rasterTime = future.result()
+            renderLatency.observe(fillTime, stage='fill')
+            renderLatency.observe(rasterTime, stage='rasterize')
+            if key is not None:
+                try:
+                    self.cache.put(key, pngBytes)
+                except OSError as e:
+                    log.warning("⚠️ Could not cache card %s: %s", ty, e)
+            result.set_result(pngBytes)
+        except Exception as e:
+            if isinstance(e, BrokenProcessPool):
+                self._discard(pool)
+            log.warning("⚠️ Card render failed for %s: %s", ty, e)
+            result.set_exception(e)
+        finally:
+            # Whatever went wrong above, the caller must not wait forever
+            if not result.done():
+                result.set_exception(RuntimeError(f"Card render for {ty} was lost"))
+            self._finish(ty)
+
+    def _finish(self, ty):
+        with self.lock:
+            self.queued -= 1
+            cardQueueDepth.set(self.queued)
+            waiting = self.waiting.get(ty)
+            if waiting:
+                # Hand the freed slot straight to the next card of this type
+                nextJob = waiting.popleft()
+            else:
+                nextJob = None
+                self.running[ty] -= 1
+        if nextJob is not None:
+            self._start(nextJob)
+
+    def warmup(self, blankCards, limit=None):
+        """
+        Pre-render every (blank, fillWord) pair of every card type into the
+        cache until it is full or `limit` renders were started. Renders go
+        through `submit` like any request, at most one per worker at a time,
+        so live `--card/` requests still find room in the queue.
+
+        Args:
+            blankCards (dict): Contents of blankCards.json
+            limit (int): Maximum number of new renders (default: no limit)
+
+        Returns:
+            int: Cards rendered
+        """
+        if not self.cache:
+            return 0
+        cache = self.cache
+        inFlight = deque()
+        started = done = 0
+
+        def settle():
+            nonlocal done
+            ty, future = inFlight.popleft()
+            try:
+                future.result(RENDER_TIMEOUT)
+                done += 1
+            except Exception:
+                pass  # Already logged by _done
+
+        jobs = ((ty, card, topTxt, botTxt)
+                for ty, card in blankCards.items()
+                for topTxt in dict.fromkeys(card['blanks'])
+                for botTxt in dict.fromkeys(card['fillWords']))
+        for ty, card, topTxt, botTxt in jobs:
+            if limit is not None and started >= limit:
+                break
+            # Stop before warmup starts evicting its own renders
+            avgSize = cache.size / len(cache.entries) if cache.entries else 0
+            if cache.size + (len(inFlight) + 1) * avgSize > cache.maxBytes:
+                log.info("🔥 Card cache full, stopping warmup")
+                break
+            try:
+                key = cache.key(card['cardImg'], topTxt, botTxt,
+                                card['maxChars'], card['lineHeight'])
+            except OSError as e:
+                log.warning("⚠️ Warmup failed for %s: %s", ty, e)
+                continue
+            with cache.lock:
+                cached = key in cache.entries
+            if cached:
+                continue
+            while len(inFlight) >= self.workers:
+                settle()
+            while True:
+                try:
+                    inFlight.append((ty, self.submit(ty, card, topTxt, botTxt)))
+                    break
+                except CardBusy:
+                    # Live requests filled the queue; let one of ours finish first
+                    if inFlight:
+                        settle()
+                    else:
+                        time.sleep(1)
+            started += 1
+        while inFlight:
+            settle()
+        log.info("🔥 Card cache warmup rendered %d cards", done)
+        return done
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown(wait=False, cancel_futures=True)
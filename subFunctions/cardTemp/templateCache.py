@@ -0,0 +1,82 @@
+import os
+import copy
+import threading
+from bs4 import BeautifulSoup
+
+
+class SVGTemplate:
+    """
+    A card template parsed once and kept in memory.
+
+    Attributes:
+        soup: The parsed document, kept only as a tag factory for wrapText
+        root: The <svg> element that gets cloned for every render
+        prolog (str): Everything serialized before <svg> (XML declaration etc.)
+        slotPaths (list): Child-index paths from `root` to each non-empty
+            text/tspan element, in document order
+        dims (tuple): (width, height) resolved from viewBox/width/height
+    """
+
+    def __init__(self, soup, dims):
+        self.soup = soup
+        self.root = soup.find('svg')
+        self.dims = dims
+        self.prolog = str(soup).split('<svg', 1)[0] if self.root else ''
+
+        txtElms = soup.find_all(['text', 'tspan'])
+        self.slotPaths = [elmPath(elm, self.root)
+                          for elm in txtElms if elm.get_text(strip=True)]
+
+    def clone(self):
+        """
+        Returns:
+            tuple: (root copy, list of slot elements inside that copy)
+        """
+        root = copy.copy(self.root)
+        return root, [followPath(root, path) for path in self.slotPaths]
+
+
+def elmPath(elm, root):
+    path = []
+    while elm is not root:
+        parent = elm.parent
+        # Identity match; Tag equality compares markup, not position
+        path.append(next(i for i, c in enumerate(parent.contents) if c is elm))
+        elm = parent
+    path.reverse()
+    return path
+
+
+def followPath(root, path):
+    elm = root
+    for i in path:
+        elm = elm.contents[i]
+    return elm
+
+
+_templates = {}
+_templateLock = threading.Lock()
+
+
+def getTemplate(svgFileIn, dimsFn):
+    """
+    Return the cached template for `svgFileIn`, re-parsing only when the
+    file's mtime changed.
+
+    Args:
+        svgFileIn (str): Path to the template SVG
+        dimsFn: Callable taking the <svg> element and returning (width, height)
+    """
+    mtime = os.stat(svgFileIn).st_mtime_ns
+    with _templateLock:
+        cached = _templates.get(svgFileIn)
+        if cached and cached[0] == mtime:
+            return cached[1]
+
+    with open(svgFileIn, 'r', encoding='utf-8') as f:
+        soup = BeautifulSoup(f.read(), 'xml')
+    template = SVGTemplate(soup, dimsFn(soup.find('svg')))
+
+    with _templateLock:
+        _templates[svgFileIn] = (mtime, template)
+    return template
@@ -0,0 +1,106 @@
+import os
+import time
+import threading
+from subFunctions.storage.sqlite import openDB, transaction
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sweeps (
+    id INTEGER PRIMARY KEY,
+    channel TEXT NOT NULL,
+    oldest REAL NOT NULL,
+    started REAL NOT NULL,
+    finished REAL
+);
+CREATE INDEX IF NOT EXISTS sweepsOpen ON sweeps (channel, finished);
+CREATE TABLE IF NOT EXISTS deleted (
+    sweep INTEGER NOT NULL,
+    ts TEXT NOT NULL,
+    PRIMARY KEY (sweep, ts)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS plans (
+    channel TEXT PRIMARY KEY,
+    oldest REAL NOT NULL,
+    messages INTEGER NOT NULL,
+    threads INTEGER NOT NULL,
+    replies INTEGER NOT NULL,
+    eta REAL NOT NULL,
+    created REAL NOT NULL
+);
+"""
+
+
+class SweepStore:
+    """
+    SQLite checkpoints for `--hookie` sweeps.
+
+    A sweep keeps its cutoff and every message ts it has deleted. Until it
+    finishes it stays open, so the next sweep of that channel after a crash
+    or a cancel resumes it: same cutoff, and messages already deleted are
+    skipped instead of being sent to chat.delete again. The last dry-run
+    plan of each channel is kept too.
+
+    Args:
+        path (str): SQLite database file (default: 'cache/sweeps.db')
+    """
+
+    def __init__(self, path=os.path.join('cache', 'sweeps.db')):
+        self.lock = threading.Lock()
+        self.db = openDB(path, SCHEMA)
+
+    def open(self, channel, oldest):
+        """
+        Resume the unfinished sweep of `channel`, or start a new one.
+
+        Returns:
+            tuple: (sweep id, cutoff timestamp, set of ts already deleted)
+        """
+        with self.lock:
+            row = self.db.execute(
+                "SELECT id, oldest FROM sweeps WHERE channel = ? AND finished IS NULL "
+                "ORDER BY id DESC LIMIT 1", (channel,)).fetchone()
+            if row is None:
+                cursor = self.db.execute(
+                    "INSERT INTO sweeps (channel, oldest, started) VALUES (?, ?, ?)",
+                    (channel, oldest, time.time()))
+                return cursor.lastrowid, oldest, set()
+
+            sweepID, oldest = row
+            done = {ts for (ts,) in self.db.execute(
+                "SELECT ts FROM deleted WHERE sweep = ?", (sweepID,))}
+        return sweepID, oldest, done
+
+    def markDeleted(self, sweepID, ts):
+        with self.lock:
+            self.db.execute(
+                "INSERT OR IGNORE INTO deleted (sweep, ts) VALUES (?, ?)", (sweepID, ts))
+
+    def finish(self, sweepID):
+        with self.lock, transaction(self.db):
+            self.db.execute(
+                "UPDATE sweeps SET finished = ? WHERE id = ?", (time.time(), sweepID))
+            # Finished sweeps never resume, their ts list is dead weight
+            self.db.execute("DELETE FROM deleted WHERE sweep = ?", (sweepID,))
+
+    def pending(self, channel):
+        """
+        Returns:
+            tuple: (cutoff, deleted count) of the unfinished sweep, or None
+        """
+        with self.lock:
+            return self.db.execute(
+                "SELECT s.oldest, (SELECT COUNT(*) FROM deleted d WHERE d.sweep = s.id) "
+                "FROM sweeps s WHERE s.channel = ? AND s.finished IS NULL "
+                "ORDER BY s.id DESC LIMIT 1", (channel,)).fetchone()
+
+    def savePlan(self, channel, oldest, messages, threads, replies, eta):
+        with self.lock:
+            self.db.execute(
+                "INSERT OR REPLACE INTO plans "
+                "(channel, oldest, messages, threads, replies, eta, created) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (channel, oldest, messages, threads, replies, eta, time.time()))
+
+    def close(self):
+        with self.lock:
+            self.db.close()
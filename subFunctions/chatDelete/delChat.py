@@ -1,82 +1,286 @@
 import os
 import time
+import logging
+import threading
 import schedule
 from dotenv import load_dotenv
-from slack_sdk import WebClient
 from datetime import datetime, timedelta
 from slack_sdk.errors import SlackApiError
+from concurrent.futures import ThreadPoolExecutor
+from subFunctions.slackClient.clients import Cancelled, getClient, limiter
+from subFunctions.metrics.metrics import deletedMessages
 
 
-def APIreqDelay(channelID, messageTS, attempts, client):
-    retries = 0
-    while retries < attempts:
+log = logging.getLogger(__name__)
+
+
+PAGE_SIZE = 200
+# Methods a sweep calls
+SWEEP_METHODS = ('chat.delete', 'conversations.history', 'conversations.replies')
+
+
+def APIreqDelay(channelID, messageTS, client, stopEvent=None):
+    """
+    Delete a single message. Throttling and `Retry-After` backoff are
+    handled by the shared client.
+
+    Returns:
+        bool: True if the message is gone, False otherwise
+
+    Raises:
+        Cancelled: The sweep was stopped while the call waited for the limiter
+    """
+    if stopEvent is not None and stopEvent.is_set():
+        return False
+    try:
+        client.chat_delete(channel=channelID, ts=str(messageTS))
+        deletedMessages.inc()
+        log.debug("Deleted message %s", messageTS)
+        return True
+    except SlackApiError as e:
+        error = e.response["error"]
+        if error == 'message_not_found':
+            # Already gone, nothing left to do
+            return True
+        log.error("Failed to delete message %s: %s", messageTS, error)
+        return False
+
+
+def getHistory(client, channelID, oldest, stopEvent=None):
+    """
+    Yield every message newer than `oldest`, following pagination cursors.
+    """
+    cursor = None
+    while stopEvent is None or not stopEvent.is_set():
         try:
-            client.chat_delete(channel=channelID, ts=str(messageTS))
-            print(f"Deleted Message with Timestamp {messageTS}")
-            time.sleep(1)
-            break
-        except SlackApiError as e:
-            if e.response["error"] == 'ratelimited':
-                retry_after = int(e.response.headers.get("Retry-After", 1))
-                print(
-                    f"⏱️ Rate limit hit. Retrying after {retry_after} seconds")
-                time.sleep(retry_after)
-                retries += 1
-            else:
-                print(f"Failed to delete message {
-                      messageTS}: {e.response['error']}")
-                break
+            response = client.conversations_history(
+                channel=channelID, oldest=str(oldest), limit=PAGE_SIZE, cursor=cursor)
+        except Cancelled:
+            return
+
+        messages = response.get('messages', [])
+        log.info("Fetched %d messages from channel %s", len(messages), channelID)
+        yield from messages
+
+        cursor = (response.get('response_metadata') or {}).get('next_cursor')
+        if not cursor:
+            return
+
+
+def getThreadMsg(client, channelID, threadTS, timeLimit, stopEvent=None):
+    """
+    Yield every message of a thread (parent included) newer than
+    `timeLimit`, following pagination cursors to the end of the thread.
+    """
+    cursor = None
+    seen = set()
+    while stopEvent is None or not stopEvent.is_set():
+        try:
+            response = client.conversations_replies(
+                channel=channelID, ts=threadTS, oldest=str(timeLimit), inclusive=True,
+                limit=PAGE_SIZE, cursor=cursor)
+        except Cancelled:
+            return
+
+        threadMsgs = response.get('messages', [])
+        log.debug("📝 Found %d messages in thread %s", len(threadMsgs), threadTS)
+
+        for msg in threadMsgs:
+            # Slack may repeat the parent at the top of every page
+            if msg['ts'] in seen or float(msg['ts']) < timeLimit:
+                continue
+            seen.add(msg['ts'])
+            yield msg
+
+        cursor = (response.get('response_metadata') or {}).get('next_cursor')
+        if not cursor:
+            return
 
 
-def getThreadMsg(client, channelID, threadTS, timeLimit):
-    response = client.conversations_replies(
-        channel=channelID,
-        ts=threadTS,
-        inclusive=True
-    )
+def deleteMessage(token, channelID, timeRange, workers=None, stopEvent=None, stats=None,
+                  threadWorkers=None, store=None):
+    """
+    Delete every message (and thread reply) in a channel newer than
+    `timeRange` weeks.
 
-    threadMsgs = response.get('messages', [])
-    print(f"📝 Found {len(threadMsgs)} messages in thread {threadTS}")
+    History is read page by page with the `oldest` filter applied on the
+    server, and deletes run on a bounded worker pool. Threads are expanded
+    by a second small pool that pages through each thread and feeds its
+    replies straight into the delete queue, so fetching busy threads
+    overlaps with deleting. Every call goes through the shared client, whose
+    per-method buckets keep throughput at the tier limits and let a single
+    `Retry-After` pause every worker together.
 
-    # Filter messages by time limit
-    msgToDel = []
-    for msg in threadMsgs:
-        msgTS = float(msg['ts'])
-        if msgTS >= timeLimit:
-            msgToDel.append(msg)
+    With a SweepStore every deleted ts is checkpointed, and an unfinished
+    sweep of the same channel is resumed (same cutoff, deleted messages
+    skipped) instead of starting over.
 
-    return msgToDel
+    Args:
+        token (str): User token allowed to delete the messages
+        channelID (str): Channel to sweep
+        timeRange (int): How many weeks back to delete
+        workers (int): Size of the delete pool (default: env `deleteWorkers` or 4)
+        threadWorkers (int): Threads expanded at once (default: env `threadWorkers` or 2)
+        stopEvent (threading.Event): Set to stop the sweep early
+        stats (dict): Filled in place with `found`, `deleted`, `failed`,
+            `cancelled` (queued but not attempted once stopEvent was set),
+            `skipped` (deleted by an earlier run) and `waited` (seconds this
+            sweep's calls spent rate limited, summed over its workers) so
+            callers can report progress
+        store (SweepStore): Checkpoint store (default: no checkpoints)
 
+    Returns:
+        dict: The same stats dict
+    """
+    if workers is None:
+        workers = int(os.getenv('deleteWorkers', 4))
+    if threadWorkers is None:
+        threadWorkers = int(os.getenv('threadWorkers', 2))
+    if stopEvent is None:
+        stopEvent = threading.Event()
+    # Own copy of the client: `waited` only counts this sweep's calls, and
+    # none of them sleeps through a rate limit once the sweep is stopped
+    client = getClient(token).scoped(stopEvent)
 
-def deleteMessage(token, channelID, timeRange):
-    client = WebClient(token=token)
     rightNow = datetime.now()
     timeLimit = rightNow - timedelta(weeks=timeRange)
     timeTimestamp = timeLimit.timestamp()
-    # Fetch messages from the DM channel
-    response = client.conversations_history(channel=channelID)
-    messages = response['messages']
-    print(f"Fetched {len(messages)} messages from channel {channelID}")
 
-    for message in messages:
-        messageTS = float(message['ts'])
-        if messageTS >= timeTimestamp:
+    sweepID, done = None, set()
+    if store is not None:
+        sweepID, timeTimestamp, done = store.open(channelID, timeTimestamp)
+        if done:
+            log.info("🧹 Resuming sweep %s: %d messages already deleted", sweepID, len(done))
+
+    if stats is None:
+        stats = {}
+    stats.update({'found': 0, 'deleted': 0, 'failed': 0, 'cancelled': 0, 'skipped': 0,
+                  'waited': 0.0})
+    statsLock = threading.Lock()
+    # Bound queued deletes and pending threads so a huge channel is not buffered
+    slots = threading.BoundedSemaphore(workers * 4)
+    threadSlots = threading.BoundedSemaphore(threadWorkers * 2)
+
+    def worker(ts):
+        try:
+            if stopEvent.is_set():
+                # Never attempted, so neither deleted nor failed
+                with statsLock:
+                    stats['cancelled'] += 1
+                return
+            try:
+                ok = APIreqDelay(channelID, ts, client, stopEvent)
+            except Cancelled:
+                with statsLock:
+                    stats['cancelled'] += 1
+                return
+            if ok and sweepID is not None:
+                store.markDeleted(sweepID, ts)
+            with statsLock:
+                stats['deleted' if ok else 'failed'] += 1
+                stats['waited'] = client.waited
+        finally:
+            slots.release()
+
+    def enqueue(pool, ts):
+        if ts in done:
+            # Idempotent: deleted by the interrupted run already
+            with statsLock:
+                stats['skipped'] += 1
+            return
+        with statsLock:
+            stats['found'] += 1
+        slots.acquire()
+        pool.submit(worker, ts)
+
+    def expand(pool, threadTS):
+        # Producer: delete thread messages (including the parent) page by page
+        try:
+            for msg in getThreadMsg(client, channelID, threadTS, timeTimestamp, stopEvent):
+                enqueue(pool, msg['ts'])
+        except SlackApiError as e:
+            log.error("Failed to read thread %s: %s", threadTS, e.response['error'])
+        finally:
+            threadSlots.release()
+
+    # Leaving the block waits for thread expansion first, then for the deletes
+    with ThreadPoolExecutor(max_workers=workers) as pool, \
+            ThreadPoolExecutor(max_workers=threadWorkers) as threadPool:
+        for message in getHistory(client, channelID, timeTimestamp, stopEvent):
+            if stopEvent.is_set():
+                break
 
             # Check if this message has replies
             if message.get('reply_count', 0) > 0:
-                threadTS = message['ts']
+                threadSlots.acquire()
+                threadPool.submit(expand, pool, message['ts'])
+            else:
+                enqueue(pool, message['ts'])
 
-                # Get all messages in this thread
-                threadMsgs = getThreadMsg(
-                    client, channelID, threadTS, timeTimestamp)
+    if sweepID is not None and not stopEvent.is_set():
+        store.finish(sweepID)
+    stats['waited'] = client.waited
+    log.info("🧹 Sweep finished: %d deleted, %d failed", stats['deleted'], stats['failed'])
+    return stats
 
-                # Delete thread messages (including the parent)
-                for threadMsg in threadMsgs:
-                    APIreqDelay(channelID, threadMsg['ts'], 5, client)
-            else:
-                APIreqDelay(channelID, message['ts'], 5, client)
-        else:
-            print(f"⏭️ Skipping message {message['ts']} (outside time range)")
+
+def planSweep(token, channelID, timeRange, stopEvent=None, stats=None, store=None):
+    """
+    Dry run of deleteMessage: count what a sweep would delete and estimate
+    how long it takes at the current rate limits. Nothing is deleted.
+
+    Only history is read; thread sizes come from each parent's
+    `reply_count`, so planning costs one call per 200 messages.
+
+    Returns:
+        dict: `messages`, `threads`, `replies`, `skipped` (already deleted by
+        an unfinished sweep, which would be resumed; informational only, as
+        deleted messages no longer show up in history) and `eta` in seconds
+    """
+    client = getClient(token).scoped(stopEvent)
+    timeTimestamp = (datetime.now() - timedelta(weeks=timeRange)).timestamp()
+    skipped = 0
+    if store is not None:
+        pending = store.pending(channelID)
+        if pending:
+            timeTimestamp, skipped = pending
+
+    if stats is None:
+        stats = {}
+    stats.update({'messages': 0, 'threads': 0, 'replies': 0, 'skipped': skipped, 'eta': 0.0})
+    pages = 0
+    for message in getHistory(client, channelID, timeTimestamp, stopEvent):
+        stats['messages'] += 1
+        if message.get('reply_count', 0) > 0:
+            stats['threads'] += 1
+            stats['replies'] += message['reply_count']
+            pages += 1 + message['reply_count'] // PAGE_SIZE
+    pages += stats['messages'] // PAGE_SIZE + 1
+
+    # Reads and deletes use separate buckets and overlap, the slower one wins
+    deletes = stats['messages'] + stats['replies']
+    deleteRate = limiter.bucket('chat.delete').rate
+    readRate = limiter.bucket('conversations.replies').rate
+    stats['eta'] = max(deletes / deleteRate, pages / readRate)
+
+    if store is not None:
+        store.savePlan(channelID, timeTimestamp, stats['messages'], stats['threads'],
+                       stats['replies'], stats['eta'])
+    return stats
+
+
+def planSummary(plan):
+    minutes, seconds = divmod(int(plan['eta']), 60)
+    hours, minutes = divmod(minutes, 60)
+    lines = [
+        "📋 *Sweep plan* (dry run, nothing deleted)",
+        f"Messages: {plan['messages']}",
+        f"Threads: {plan['threads']} ({plan['replies']} replies)",
+    ]
+    if plan['skipped']:
+        lines.append(f"Already deleted by the unfinished sweep: {plan['skipped']}")
+    lines.append(f"Estimated duration: {hours}h {minutes}m {seconds}s at the current rate limit")
+    return '\n'.join(lines)
 
 
 def main():
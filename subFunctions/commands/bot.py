@@ -0,0 +1,387 @@
+import os
+import re
+import random
+import logging
+import threading
+from subFunctions.chatDelete.checkpoint import SweepStore
+from subFunctions.cardTemp.cardCache import CardCache
+from subFunctions.cardTemp.renderPool import CardRenderer, CardBusy, RENDER_TIMEOUT
+from subFunctions.passGen.main import passBatch, loadPolicy
+from subFunctions.jobs.jobManager import JobManager
+from subFunctions.coordination.coordinator import Coordinator
+from subFunctions.router.router import CommandRouter, CommandCtx
+from subFunctions.router.messageFilter import MessageFilter
+from subFunctions.mediaIndex.mediaIndex import MediaIndex
+from subFunctions.assetPipeline.pipeline import AssetPipeline
+from subFunctions.config.config import ConfigStore
+from subFunctions.procMenu.views import slackListView
+from subFunctions.spoiler.store import SpoilerStore
+from subFunctions.metrics.metrics import REGISTRY, startMetricsServer
+from subFunctions.metrics.logs import kv
+from subFunctions.slackClient.clients import getClient
+from subFunctions.commands.effects import (
+    Say, SendAsset, Upload, Wait, Offload, drive, adrive)
+
+
+log = logging.getLogger('chatListener')
+
+meDir = ('img', 'memes')
+
+
+def sweeper():
+    # Imported on the first --hookie, not at startup (see startupMode)
+    from subFunctions.chatDelete import delChat
+    return delChat
+
+
+def preload():
+    # startupMode=eager: pay for every deferred import before connecting
+    import subFunctions.chatDelete.delChat  # noqa: F401
+    import subFunctions.cardTemp.main  # noqa: F401
+
+
+class Bot:
+    """
+    Everything main.py (Bolt App) and asyncMain.py (AsyncApp) share: the
+    services configured from the environment and the `--` message commands.
+
+    Commands are generators yielding effects (see effects.py); `perform`
+    carries them out with blocking calls, `aperform` with awaits, so each
+    entrypoint only adds its client, its Bolt listeners and a runner
+    middleware on `router`. Call after load_dotenv().
+
+    Args:
+        client: Slack client the commands reply with (WebClient or AsyncWebClient)
+        registry: AssetRegistry class to send media with, matching `client`
+        runtime (str): 'sync' or 'async'
+    """
+
+    def __init__(self, client, registry, runtime='sync'):
+        self.runtime = runtime
+        self.userToken = os.getenv('userToken')
+        self.botToken = os.getenv('botToken')
+        self.appToken = os.getenv('socketToken')
+        self.userIDs = os.getenv('userID').split(',')
+        self.timeRange = int(os.getenv('timeRange'), 10)
+        # 'lazy': defer heavy imports (cards, --hookie) and checks until first use
+        self.lazyStart = os.getenv('startupMode', 'lazy') != 'eager'
+        # Set by the async runtime; lets job threads hand work back to the event loop
+        self.loop = None
+
+        self.client = client
+        # Downscaled / recompressed media variants, rebuilt at startup for changed files
+        self.pipeline = AssetPipeline(
+            ['img', 'audio'],
+            maxDim=int(os.getenv('assetMaxDim', 1280)),
+            quality=int(os.getenv('assetQuality', 80)),
+            audioBitrate=os.getenv('audioBitrate', '96k')
+        )
+        self.assets = registry(client, pipeline=self.pipeline)
+        # Several instances pointed at one coordDB split events and jobs between them
+        self.coordinator = Coordinator(os.getenv('coordDB')) if os.getenv('coordDB') else None
+        # Sweeps run on their own job threads, which need a blocking client
+        self.jobs = JobManager(getClient(self.botToken),
+                               interval=int(os.getenv('jobInterval', 30)),
+                               coordinator=self.coordinator)
+
+        # Live JSON config, hot-reloaded and swapped atomically (see ConfigStore)
+        self.config = ConfigStore(
+            interval=int(os.getenv('configPoll', 5)),
+            # Compile the /procmenu view off the ack path for every new version
+            onSwap=lambda cfg: slackListView(cfg.proc, version=cfg.version)
+        )
+        self.cardCache = CardCache(maxBytes=int(os.getenv('cardCacheMB', 200)) * 1024**2)
+        # --card/ renders on a process pool; a full queue answers "busy" right away
+        self.cards = CardRenderer(
+            workers=int(os.getenv('cardWorkers', 0)) or None,
+            maxQueue=int(os.getenv('cardQueue', 0)) or None,
+            cache=self.cardCache
+        )
+        # Checkpoints so an interrupted --hookie resumes instead of starting over
+        self.sweeps = SweepStore()
+        self.spoilers = SpoilerStore(ttl=float(os.getenv('spoilerTTLDays', 7)) * 86400)
+        # /procmenu output: one combined message ('batched') or one per selection ('separate')
+        self.procBatched = os.getenv('procOutput', 'batched') != 'separate'
+        self.media = MediaIndex(
+            ['img', 'audio'],
+            rescanInterval=int(os.getenv('mediaRescan', 30)),
+            # bool('false') would be True, so only explicit yes-values turn it on
+            noRepeat=os.getenv('memeNoRepeat', '').strip().lower() in ('1', 'true', 'yes')
+        )
+        # Drop chatter, bot and unauthorized messages before listener dispatch
+        self.messageFilter = MessageFilter(self.userIDs)
+
+        self.router = CommandRouter()
+        self._routes()
+
+    def _routes(self):
+        r = self.router
+        r.command("--hookie")(self.hookieCmd)
+        # Background job control: --hookie/status[/id], --hookie/cancel[/id],
+        # and --hookie/plan for a dry run with counts and an ETA
+        r.prefix("--hookie/")(self.hookieJobCmd)
+        r.command("--comL")(self.comListCmd)
+        r.prefix("--list/")(self.listCmd)
+        r.command("--meme")(self.memeCmd)
+        r.prefix("--meme/")(self.memeCmd)
+        r.command("--sayL")(self.sayListCmd)
+        r.prefix("--say/")(self.sayCmd)
+        r.prefix("--card/")(self.cardCmd)
+        # Admin: latency histograms and Slack API counters
+        r.command("--stats")(self.statsCmd)
+        # Generate passwords: --passGen, --passGen/<count>, --passGen/<count>/<length>
+        r.command("--passGen")(self.passGenCmd)
+        r.prefix("--passGen/")(self.passGenCmd)
+
+    # Running commands
+
+    def commandCtx(self, body, say):
+        """
+        The CommandCtx for a `message` event, against the live config.
+        """
+        event = body.get('event', {})
+        text = event.get('text', '')
+        cmnd = re.search(r"--\S+", text)
+        cmnd = cmnd.group() if cmnd else text
+        log.info("command", extra=kv(cmnd=cmnd, user=event.get('user'),
+                                     channel=event.get('channel')))
+        ctx = CommandCtx(cmnd, text, event, say)
+        ctx.cfg = self.config.current()
+        return ctx
+
+    def perform(self, ctx, effect):
+        if isinstance(effect, Say):
+            return ctx.say(effect.text)
+        if isinstance(effect, SendAsset):
+            return self.assets.send(channel=effect.channel, file=effect.file,
+                                    title=effect.title, initial_comment=effect.comment)
+        if isinstance(effect, Upload):
+            return self.client.files_upload_v2(
+                channel=effect.channel, content=effect.content, filename=effect.filename,
+                title=effect.title, initial_comment=effect.comment)
+        if isinstance(effect, Wait):
+            return effect.future.result(effect.timeout)
+        if isinstance(effect, Offload):
+            return effect.fn(*effect.args)
+        raise TypeError(f"Unknown effect {effect!r}")
+
+    async def aperform(self, ctx, effect):
+        import asyncio
+        if isinstance(effect, Say):
+            return await ctx.say(effect.text)
+        if isinstance(effect, SendAsset):
+            return await self.assets.send(channel=effect.channel, file=effect.file,
+                                          title=effect.title, initial_comment=effect.comment)
+        if isinstance(effect, Upload):
+            return await self.client.files_upload_v2(
+                channel=effect.channel, content=effect.content, filename=effect.filename,
+                title=effect.title, initial_comment=effect.comment)
+        if isinstance(effect, Wait):
+            return await asyncio.wait_for(asyncio.wrap_future(effect.future), effect.timeout)
+        if isinstance(effect, Offload):
+            return await asyncio.get_running_loop().run_in_executor(None, effect.fn, *effect.args)
+        raise TypeError(f"Unknown effect {effect!r}")
+
+    def middleware(self, ctx, nxt):
+        """
+        CommandRouter middleware running a command's effects with blocking calls.
+        """
+        gen = nxt(ctx)
+        if gen is not None:
+            drive(gen, lambda effect: self.perform(ctx, effect))
+
+    async def amiddleware(self, ctx, nxt):
+        gen = await nxt(ctx)
+        if gen is not None:
+            await adrive(gen, lambda effect: self.aperform(ctx, effect))
+
+    def runOnThread(self, gen):
+        """
+        Run command effects from a job thread, on the event loop if async.
+        """
+        if self.runtime == 'async':
+            import asyncio
+            coro = adrive(gen, lambda effect: self.aperform(None, effect))
+            asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+        else:
+            drive(gen, lambda effect: self.perform(None, effect))
+
+    # Startup
+
+    def procMenuView(self, channelID):
+        cfg = self.config.current()
+        return slackListView(cfg.proc, channelID, cfg.version)
+
+    def warmCards(self, limit):
+        # The card cache lives on disk, so one instance warming it is enough
+        lease = self.coordinator.lease('cardWarmup') if self.coordinator is not None else None
+        if self.coordinator is not None and lease is None:
+            return
+        try:
+            self.cards.warmup(self.config.current().blankCards, limit=limit)
+        finally:
+            if lease is not None:
+                lease.release()
+
+    def start(self):
+        """
+        Start every background service, before the Socket Mode handler.
+        """
+        if not self.lazyStart:
+            preload()
+        self.cards.start()
+        self.config.start()
+        if os.getenv('metricsPort'):
+            startMetricsServer(int(os.getenv('metricsPort')))
+        self.procMenuView(None)
+        self.media.start()
+        self.pipeline.start()
+        if os.getenv('cardWarmup'):
+            threading.Thread(
+                target=self.warmCards, args=(int(os.getenv('cardWarmup')),), daemon=True
+            ).start()
+
+    # Commands
+
+    def nukePost(self, job):
+        cfg = self.config.current()
+        yield SendAsset(
+            job.channel, cfg.pics['--nuke'],
+            "I am death, destroyer of both worlds",
+            cfg.proc['biblical']['--judgement']
+        )
+
+    def hookieCmd(self, ctx):
+        log.debug("🧹 Chat delete function called.")
+        channel = ctx.channel
+        job, isNew = self.jobs.submit(
+            'hookie', channel,
+            lambda job: sweeper().deleteMessage(
+                self.userToken, channel, self.timeRange,
+                stopEvent=job.stopEvent, stats=job.stats, store=self.sweeps),
+            # Called on the job thread once the sweep is done
+            onDone=lambda job: self.runOnThread(self.nukePost(job))
+        )
+        if job is None:
+            yield Say("Another instance is already sweeping here, MiLord ...")
+        elif isNew:
+            yield Say(f"🧹 Sweep queued as job `{job.id}`, MiLord ...")
+        else:
+            yield Say(f"A sweep is already underway, MiLord ...\n{job.summary()}")
+
+    def postPlan(self, job):
+        # Called on the job thread once the dry run is done
+        self.jobs.client.chat_postMessage(
+            channel=job.channel, text=sweeper().planSummary(job.stats))
+
+    def hookieJobCmd(self, ctx):
+        action = ctx.args[0] if ctx.args else ''
+        jobID = ctx.args[1] if len(ctx.args) > 1 else None
+        if action == 'plan':
+            channel = ctx.channel
+            job, isNew = self.jobs.submit(
+                'plan', channel,
+                lambda job: sweeper().planSweep(
+                    self.userToken, channel, self.timeRange,
+                    stopEvent=job.stopEvent, stats=job.stats, store=self.sweeps),
+                onDone=self.postPlan
+            )
+            if job is None:
+                yield Say("Another instance is already drawing up a plan, MiLord ...")
+            elif not isNew:
+                yield Say(f"A plan is already being drawn up, MiLord ...\n{job.summary()}")
+            return
+        if action == 'status':
+            job = self.jobs.get(jobID, ctx.channel)
+        elif action == 'cancel':
+            job = self.jobs.cancel(jobID, ctx.channel)
+        else:
+            yield Say("Unknown job action, MiLord! Use plan, status or cancel.")
+            return
+        yield Say(job.summary() if job else "No such job, MiLord ...")
+
+    def comListCmd(self, ctx):
+        yield Say(f"Here are the list of Commands, MiLord ...\n{ctx.cfg.procList}")
+
+    def listCmd(self, ctx):
+        folders = ctx.cmnd.split('/')[1:]
+        # Only folders known to the media index can be listed
+        entries = self.media.children(folders)
+        if entries is None:
+            yield Say("No such folder, MiLord ...")
+            return
+        dirz = '\n'.join(entries)
+        yield Say(f"Here's the list of sub-directories, MiLord...\n{dirz}")
+
+    def memeCmd(self, ctx):
+        imgPath = self.media.pick(meDir + tuple(ctx.args), fallback=meDir)
+        if imgPath is None:
+            yield Say("No memes to be found, MiLord ...")
+            return
+        log.debug("Picked meme: %s", imgPath)
+        yield SendAsset(ctx.channel, imgPath, "Here's your meme, MiLord", "Behold thy meme!")
+
+    def sayListCmd(self, ctx):
+        yield Say(f"Here's the list MiLord:\n{ctx.cfg.audList}")
+
+    def sayCmd(self, ctx):
+        cmnd = ctx.args[0] if ctx.args else ''
+        auds = ctx.cfg.auds
+        if cmnd in auds:
+            yield SendAsset(ctx.channel, auds[cmnd], f"{cmnd}.mp3",
+                            "Here's your GOAT'ed words, MiLord ...")
+        else:
+            yield Say("Invalid Audio Command, MiLord!")
+
+    # Blank Que Game
+    def cardCmd(self, ctx):
+        ty = ctx.args[0] if ctx.args else ''
+        blankCards = ctx.cfg.blankCards
+        if ty not in blankCards:
+            yield Say("Invalid Card Type, MiLord!")
+            return
+        topTxt = random.choice(blankCards[ty]['blanks'])
+        botTxt = random.choice(blankCards[ty]['fillWords'])
+        try:
+            future = self.cards.submit(ty, blankCards[ty], topTxt, botTxt)
+            pngBytes = yield Wait(future, RENDER_TIMEOUT)
+        except CardBusy:
+            yield Say("🃏 The card press is busy, MiLord, try again in a moment ...")
+            return
+        except Exception as e:
+            log.warning("Card %s failed: %r", ty, e)
+            yield Say("🃏 The card press jammed, MiLord, try again ...")
+            return
+        yield Upload(ctx.channel, pngBytes, f"{ty}_Card.png", f"{ty}_Card.png",
+                     "Here's your Card, MiLord ...")
+
+    def statsCmd(self, ctx):
+        yield Say(f"```{REGISTRY.summary()}```")
+
+    def passGenCmd(self, ctx):
+        policy = loadPolicy(ctx.cfg.parems)
+        try:
+            count = int(ctx.args[0]) if ctx.args else 1
+            length = int(ctx.args[1]) if len(ctx.args) > 1 else policy['length']
+        except ValueError:
+            yield Say("Usage: `--passGen/<count>/<length>`, MiLord!")
+            return
+        if not (0 < count <= policy['maxCount'] and 0 < length <= policy['maxLength']):
+            yield Say(f"Up to {policy['maxCount']} passwords of at most "
+                      f"{policy['maxLength']} characters, MiLord!")
+            return
+        try:
+            passwords = yield Offload(passBatch, (count, length, policy))
+        except ValueError as e:
+            yield Say(f"❌ {e}, MiLord!")
+            return
+
+        if count == 1:
+            yield Say(f"Here's your password, MiLord ...\n{passwords[0]}")
+        elif count <= policy['inlineMax']:
+            yield Say("Here are your passwords, MiLord ...\n" + '\n'.join(passwords))
+        else:
+            # Big batches go out as one file instead of a wall of messages
+            yield Upload(ctx.channel, '\n'.join(passwords) + '\n',
+                         f"passwords_{count}x{length}.txt", f"{count} passwords",
+                         f"Here are your {count} passwords, MiLord ...")
@@ -0,0 +1,56 @@
+from collections import namedtuple
+
+
+# The `--` commands are written once, as generators that yield these instead
+# of calling Slack or blocking themselves. Each runtime performs them its own
+# way (see Bot.perform / Bot.aperform) and sends back the result, or throws
+# the error in at the `yield`, so a command reads like straight-line code.
+
+# Reply in the command's channel
+Say = namedtuple('Say', 'text')
+# Send a local media file through the asset registry
+SendAsset = namedtuple('SendAsset', 'channel file title comment')
+# Upload generated bytes / text as a new Slack file
+Upload = namedtuple('Upload', 'channel content filename title comment')
+# Wait for a concurrent.futures.Future, at most `timeout` seconds
+Wait = namedtuple('Wait', 'future timeout')
+# Run a CPU-bound call off the event loop
+Offload = namedtuple('Offload', 'fn args')
+
+
+def drive(gen, perform):
+    """
+    Run a command generator to the end, answering every effect it yields
+    with `perform(effect)`.
+
+    Returns:
+        The generator's own return value
+    """
+    result = error = None
+    while True:
+        try:
+            effect = gen.throw(error) if error is not None else gen.send(result)
+        except StopIteration as stop:
+            return stop.value
+        result = error = None
+        try:
+            result = perform(effect)
+        except Exception as e:
+            error = e
+
+
+async def adrive(gen, aperform):
+    """
+    `drive` for the asyncio runtime, awaiting `aperform(effect)`.
+    """
+    result = error = None
+    while True:
+        try:
+            effect = gen.throw(error) if error is not None else gen.send(result)
+        except StopIteration as stop:
+            return stop.value
+        result = error = None
+        try:
+            result = await aperform(effect)
+        except Exception as e:
+            error = e
@@ -0,0 +1,184 @@
+import os
+import json
+import threading
+import logging
+from subFunctions.router.router import CommandRouter
+from subFunctions.passGen.main import checkPolicy, loadPolicy
+
+
+log = logging.getLogger(__name__)
+
+
+CONFIG_FILES = {
+    'proc': 'proclamations.json',
+    'pics': 'picPaths.json',
+    'auds': 'audPaths.json',
+    'blankCards': 'blankCards.json',
+    'parems': 'parems.json',
+}
+
+CARD_KEYS = ('blanks', 'fillWords', 'cardImg', 'maxChars', 'lineHeight')
+
+
+def readJson(path):
+    with open(path, 'r', encoding='utf-8') as j:
+        return json.load(j)
+
+
+class Config:
+    """
+    The bot's JSON content plus every index derived from it.
+
+    A Config is never modified after it is built. Handlers take one snapshot
+    at the start of a command and use it throughout, so a reload happening
+    mid-command can never hand them half old, half new state.
+    """
+
+    def __init__(self, proc, pics, auds, blankCards, parems, version=0):
+        self.proc = proc
+        self.pics = pics
+        self.auds = auds
+        self.blankCards = blankCards
+        self.parems = parems
+        self.version = version
+
+        self.procList = '\n'.join(proc.keys())
+        self.picList = '\n'.join(pics.keys())
+        self.audList = '\n'.join(auds.keys())
+        self.procIndex = CommandRouter.indexProclamations(proc)
+
+
+def isPositiveInt(value):
+    # bool is an int subclass, but `true` is never a count
+    return isinstance(value, int) and not isinstance(value, bool) and value > 0
+
+
+def isNumber(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def validate(data: dict):
+    """
+    Raise ValueError if the freshly read JSON does not have the shape the
+    handlers rely on.
+    """
+    for name, content in data.items():
+        if not isinstance(content, dict):
+            raise ValueError(f"{CONFIG_FILES[name]} must hold a JSON object")
+
+    for category, cmds in data['proc'].items():
+        if not isinstance(cmds, dict) or not all(isinstance(v, str) for v in cmds.values()):
+            raise ValueError(f"proclamations.json: '{category}' must map commands to text")
+
+    for name in ('pics', 'auds'):
+        if not all(isinstance(v, str) for v in data[name].values()):
+            raise ValueError(f"{CONFIG_FILES[name]} must map names to file paths")
+
+    for ty, card in data['blankCards'].items():
+        if not isinstance(card, dict):
+            raise ValueError(f"blankCards.json: '{ty}' must be a JSON object")
+        missing = [key for key in CARD_KEYS if key not in card]
+        if missing:
+            raise ValueError(f"blankCards.json: '{ty}' is missing {missing}")
+        for key in ('blanks', 'fillWords'):
+            words = card[key]
+            if not isinstance(words, list) or not words or not all(isinstance(w, str) for w in words):
+                raise ValueError(f"blankCards.json: '{ty}' {key} must be a non-empty list of text")
+        if not isinstance(card['cardImg'], str):
+            raise ValueError(f"blankCards.json: '{ty}' cardImg must be a file path")
+        if not isPositiveInt(card['maxChars']):
+            raise ValueError(f"blankCards.json: '{ty}' maxChars must be a positive integer")
+        if not isNumber(card['lineHeight']) or card['lineHeight'] <= 0:
+            raise ValueError(f"blankCards.json: '{ty}' lineHeight must be a positive number")
+        cap = card.get('maxConcurrent')
+        if cap is not None and not isPositiveInt(cap):
+            raise ValueError(f"blankCards.json: '{ty}' maxConcurrent must be a positive integer")
+
+    if not isinstance(data['parems'].get('userIds'), dict):
+        raise ValueError("parems.json must have a 'userIds' object")
+
+    if 'passPolicy' in data['parems']:
+        if not isinstance(data['parems']['passPolicy'], dict):
+            raise ValueError("parems.json passPolicy must be a JSON object")
+        try:
+            checkPolicy(loadPolicy(data['parems']))
+        except ValueError as e:
+            raise ValueError(f"parems.json passPolicy: {e}")
+
+
+def loadConfig(version=0):
+    data = {name: readJson(path) for name, path in CONFIG_FILES.items()}
+    validate(data)
+    return Config(version=version, **data)
+
+
+class ConfigStore:
+    """
+    Holds the live Config and hot-reloads it when any JSON file changes.
+
+    A background thread polls the files' mtimes; on a change it reads,
+    validates and builds a complete new Config off the event path, then
+    swaps it in with a single reference assignment. A broken edit is
+    reported and the previous Config stays live.
+
+    Args:
+        interval (float): Seconds between mtime checks (default: 5)
+        onSwap: Optional callable(newConfig) run after every swap
+    """
+
+    def __init__(self, interval=5, onSwap=None):
+        self.interval = interval
+        self.onSwap = onSwap
+        self.stopEvent = threading.Event()
+        self.mtimes = self._mtimes()
+        self._config = loadConfig()
+
+    def _mtimes(self):
+        stamps = {}
+        for path in CONFIG_FILES.values():
+            try:
+                stamps[path] = os.stat(path).st_mtime_ns
+            except FileNotFoundError:
+                stamps[path] = None
+        return stamps
+
+    def current(self):
+        return self._config
+
+    def reload(self):
+        """
+        Returns:
+            bool: True if a new Config was swapped in
+        """
+        try:
+            config = loadConfig(self._config.version + 1)
+        except Exception as e:
+            # Whatever a broken edit trips over, the last good Config stays live
+            log.warning("⚠️ Config reload rejected, keeping version %d: %r", self._config.version, e)
+            return False
+
+        self._config = config
+        log.info("🔄 Config reloaded (version %d)", config.version)
+        if self.onSwap:
+            try:
+                self.onSwap(config)
+            except Exception as e:
+                log.exception("⚠️ Config version %d is live, but onSwap failed: %r", config.version, e)
+        return True
+
+    def _watch(self):
+        while not self.stopEvent.wait(self.interval):
+            try:
+                mtimes = self._mtimes()
+                if mtimes != self.mtimes:
+                    self.mtimes = mtimes
+                    self.reload()
+            except Exception as e:
+                # The watcher must outlive any single bad iteration
+                log.exception("⚠️ Config watch error, keeping version %d: %r", self._config.version, e)
+
+    def start(self):
+        threading.Thread(target=self._watch, name='config-watch', daemon=True).start()
+
+    def stop(self):
+        self.stopEvent.set()
@@ -0,0 +1,222 @@
+import os
+import time
+import uuid
+import socket
+import threading
+import logging
+from slack_bolt import BoltResponse
+from subFunctions.storage.sqlite import openDB
+
+
+log = logging.getLogger(__name__)
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    key TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    seen REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS eventsSeen ON events (seen);
+CREATE TABLE IF NOT EXISTS leases (
+    name TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    expires REAL NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    channel TEXT NOT NULL,
+    owner TEXT NOT NULL,
+    status TEXT NOT NULL,
+    summary TEXT NOT NULL,
+    cancel INTEGER NOT NULL DEFAULT 0,
+    started REAL NOT NULL,
+    updated REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS jobsChannel ON jobs (channel, started);
+"""
+
+# Seconds a finished job stays visible to --hookie/status
+JOB_TTL = 86400
+
+
+class Lease:
+    """
+    A claimed lease, renewed in the background every third of its TTL until
+    released. Usable as a context manager.
+
+    If a renewal finds another instance took the lease over (this one
+    stalled past its TTL), `onLost` is called so the holder can stop the
+    work the lease was guarding.
+    """
+
+    def __init__(self, coordinator, name, ttl, onLost=None):
+        self.coordinator = coordinator
+        self.name = name
+        self.ttl = ttl
+        self.onLost = onLost
+        self.lost = False
+        self.released = threading.Event()
+        threading.Thread(target=self._renew, name=f"lease-{name}", daemon=True).start()
+
+    def _renew(self):
+        while not self.released.wait(self.ttl / 3):
+            if not self.coordinator._claim(self.name, self.ttl):
+                log.warning("⚠️ Lost lease %s to another instance", self.name)
+                self.lost = True
+                if self.onLost:
+                    self.onLost()
+                return
+
+    def release(self):
+        if not self.released.is_set():
+            self.released.set()
+            if not self.lost:
+                self.coordinator._release(self.name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class Coordinator:
+    """
+    SQLite coordination store shared by every bot instance on the host.
+
+    Several instances can hold Socket Mode connections for the same app;
+    this makes sure each event is handled by exactly one of them (first
+    instance to claim its event_id / trigger_id wins), and that long jobs
+    (sweeps, card warmup) run on exactly one instance by holding a lease.
+    An instance that dies stops renewing, so its leases expire after `ttl`.
+    Jobs also publish their status here, so any instance can report on or
+    cancel a job another one is running.
+
+    Args:
+        path (str): SQLite database file all instances point at
+        leaseTTL (float): Seconds a lease survives without renewal (default: 90)
+        dedupTTL (float): Seconds claimed event ids are remembered (default: 1 hour)
+    """
+
+    def __init__(self, path, leaseTTL=90, dedupTTL=3600):
+        self.instanceID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.leaseTTL = leaseTTL
+        self.dedupTTL = dedupTTL
+        self.lastPurge = 0.0
+        self.lock = threading.Lock()
+        self.db = openDB(path, SCHEMA)
+
+    @staticmethod
+    def eventKey(body: dict):
+        # Events carry event_id; commands and interactions a unique trigger_id
+        return body.get('event_id') or body.get('trigger_id')
+
+    def claimEvent(self, key):
+        """
+        Returns:
+            bool: True if this instance should handle the event
+        """
+        now = time.time()
+        with self.lock:
+            claimed = self.db.execute(
+                "INSERT OR IGNORE INTO events (key, owner, seen) VALUES (?, ?, ?)",
+                (key, self.instanceID, now)).rowcount == 1
+            if now - self.lastPurge > self.dedupTTL / 10:
+                self.db.execute("DELETE FROM events WHERE seen < ?", (now - self.dedupTTL,))
+                self.db.execute("DELETE FROM jobs WHERE updated < ?", (now - JOB_TTL,))
+                self.lastPurge = now
+        return claimed
+
+    def _claim(self, name, ttl):
+        now = time.time()
+        with self.lock:
+            return self.db.execute(
+                "INSERT INTO leases (name, owner, expires) VALUES (?, ?, ?) "
+                "ON CONFLICT (name) DO UPDATE SET owner = excluded.owner, expires = excluded.expires "
+                "WHERE leases.owner = excluded.owner OR leases.expires < ?",
+                (name, self.instanceID, now + ttl, now)).rowcount == 1
+
+    def _release(self, name):
+        with self.lock:
+            self.db.execute(
+                "DELETE FROM leases WHERE name = ? AND owner = ?", (name, self.instanceID))
+
+    def lease(self, name, ttl=None, onLost=None):
+        """
+        Claim the lease `name` for this instance.
+
+        Returns:
+            Lease: The held lease, or None if another instance holds it
+        """
+        ttl = ttl or self.leaseTTL
+        if not self._claim(name, ttl):
+            return None
+        return Lease(self, name, ttl, onLost)
+
+    def publishJob(self, job):
+        """
+        Record this instance's view of `job`; a pending cancel request is kept.
+        """
+        with self.lock:
+            self.db.execute(
+                "INSERT INTO jobs (id, kind, channel, owner, status, summary, started, updated) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (id) DO UPDATE SET status = excluded.status, "
+                "summary = excluded.summary, updated = excluded.updated",
+                (job.id, job.kind, job.channel, self.instanceID, job.status,
+                 job.summary(), job.started, time.time()))
+
+    def jobRow(self, jobID=None, channel=None):
+        """
+        Look up a published job by id, or the most recent one in `channel`.
+
+        Returns:
+            dict: The job's row, or None
+        """
+        with self.lock:
+            if jobID:
+                cursor = self.db.execute("SELECT * FROM jobs WHERE id = ?", (jobID,))
+            else:
+                cursor = self.db.execute(
+                    "SELECT * FROM jobs WHERE channel = ? ORDER BY started DESC LIMIT 1",
+                    (channel,))
+            row = cursor.fetchone()
+            if row is None:
+                return None
+            return dict(zip((c[0] for c in cursor.description), row))
+
+    def requestCancel(self, jobID):
+        """
+        Flag a running job for cancellation; its owner polls the flag.
+
+        Returns:
+            bool: True if the job was still running
+        """
+        with self.lock:
+            return self.db.execute(
+                "UPDATE jobs SET cancel = 1 WHERE id = ? AND status IN ('queued', 'running')",
+                (jobID,)).rowcount == 1
+
+    def cancelRequested(self, jobID):
+        with self.lock:
+            row = self.db.execute("SELECT cancel FROM jobs WHERE id = ?", (jobID,)).fetchone()
+        return bool(row and row[0])
+
+    def middleware(self, body, next):
+        """
+        Bolt global middleware dropping events another instance already took.
+        """
+        key = self.eventKey(body)
+        if key is None or self.claimEvent(key):
+            return next()
+        return BoltResponse(status=200, body='')
+
+    async def amiddleware(self, body, next):
+        import asyncio
+        key = self.eventKey(body)
+        # The claim is a SQLite write that may wait on another instance's lock
+        if key is None or await asyncio.to_thread(self.claimEvent, key):
+            return await next()
+        return BoltResponse(status=200, body='')
@@ -0,0 +1,220 @@
+import time
+import uuid
+import threading
+import logging
+
+
+log = logging.getLogger(__name__)
+
+
+class Job:
+    """
+    A long running task (e.g. a `--hookie` sweep) executed off the event path.
+
+    `stats` is a plain dict the task fills in place; the reporter thread reads
+    it to post progress, so the task never has to know about Slack threads.
+    """
+
+    def __init__(self, kind, channel):
+        self.id = uuid.uuid4().hex[:8]
+        self.kind = kind
+        self.channel = channel
+        self.threadTS = None
+        self.status = 'queued'
+        self.error = None
+        self.stats = {}
+        self.started = time.time()
+        self.finished = None
+        self.stopEvent = threading.Event()
+        self.lease = None
+
+    @property
+    def active(self):
+        return self.status in ('queued', 'running')
+
+    def summary(self):
+        elapsed = (self.finished or time.time()) - self.started
+        parts = [f"Job `{self.id}` ({self.kind}): *{self.status}*",
+                 f"elapsed {int(elapsed)}s"]
+        stats = dict(self.stats)
+        if 'deleted' in stats:
+            parts.append(f"deleted {stats['deleted']}")
+        if 'found' in stats:
+            remaining = stats['found'] - stats.get('deleted', 0) - stats.get('failed', 0)
+            parts.append(f"remaining {max(remaining, 0)}")
+        if stats.get('failed'):
+            parts.append(f"failed {stats['failed']}")
+        if stats.get('skipped'):
+            parts.append(f"skipped {stats['skipped']} already deleted")
+        if 'waited' in stats:
+            parts.append(f"rate-limit waits {int(stats['waited'])}s")
+        if self.error:
+            parts.append(f"error: {self.error}")
+        return ' | '.join(parts)
+
+
+class RemoteJob:
+    """
+    Read-only view of a job another instance runs, as it last published it
+    to the coordination store.
+    """
+
+    def __init__(self, row):
+        self.id = row['id']
+        self.kind = row['kind']
+        self.channel = row['channel']
+        self.owner = row['owner']
+        self.status = row['status']
+        self.started = row['started']
+        self.text = row['summary']
+
+    @property
+    def active(self):
+        return self.status in ('queued', 'running')
+
+    def summary(self):
+        return f"{self.text} | on {self.owner}"
+
+
+class JobManager:
+    """
+    Runs jobs on daemon threads and posts their progress into a Slack thread.
+
+    With a Coordinator, a job also holds the lease `job:<kind>:<channel>`
+    while it runs, so across instances only one job of a kind runs per channel.
+    Its status is published to the coordination store every `poll` seconds,
+    where status and cancel commands handled by any other instance find it;
+    a cancel flagged there, or losing the lease, stops the job.
+
+    Args:
+        client: Slack WebClient used for progress messages
+        interval (float): Seconds between progress updates (default: 30)
+        coordinator: Optional Coordinator shared with other instances
+        poll (float): Seconds between coordination store syncs (default: 2)
+    """
+
+    def __init__(self, client, interval=30, coordinator=None, poll=2):
+        self.client = client
+        self.interval = interval
+        self.coordinator = coordinator
+        self.poll = poll
+        self.jobs = {}
+        self.lock = threading.Lock()
+
+    def submit(self, kind, channel, task, onDone=None):
+        """
+        Start `task(job)` in the background, unless a job of the same kind is
+        already running in `channel`, in which case that job is returned.
+
+        Returns:
+            tuple: (Job, bool) - the job and whether it was newly created;
+                the job is None when another instance is running it
+        """
+        with self.lock:
+            for job in self.jobs.values():
+                if job.kind == kind and job.channel == channel and job.active:
+                    return job, False
+            job = Job(kind, channel)
+            if self.coordinator is not None:
+                job.lease = self.coordinator.lease(
+                    f"job:{kind}:{channel}", onLost=lambda: self._stop(job, "lease lost"))
+                if job.lease is None:
+                    return None, False
+                self.coordinator.publishJob(job)
+            self.jobs[job.id] = job
+
+        threading.Thread(
+            target=self._run, args=(job, task, onDone),
+            name=f"job-{job.id}", daemon=True
+        ).start()
+        return job, True
+
+    def get(self, jobID=None, channel=None):
+        """
+        Look up a job by id, or the most recent job posted in `channel`.
+
+        Returns:
+            Job: This instance's job, a RemoteJob another instance runs, or None
+        """
+        with self.lock:
+            if jobID:
+                job = self.jobs.get(jobID)
+                jobs = [job] if job else []
+            else:
+                jobs = [j for j in self.jobs.values() if j.channel == channel]
+        if self.coordinator is not None:
+            row = self.coordinator.jobRow(jobID, channel)
+            if row is not None and row['owner'] != self.coordinator.instanceID:
+                jobs.append(RemoteJob(row))
+        return max(jobs, key=lambda j: j.started) if jobs else None
+
+    def cancel(self, jobID=None, channel=None):
+        job = self.get(jobID, channel)
+        if isinstance(job, RemoteJob):
+            # Its owner sees the flag within `poll` seconds
+            if self.coordinator.requestCancel(job.id):
+                job.status = 'cancelling'
+        elif job is not None:
+            self._stop(job)
+        return job
+
+    def _stop(self, job, reason=None):
+        if job.active:
+            job.stopEvent.set()
+            job.status = 'cancelling'
+            if reason:
+                job.error = reason
+
+    def _post(self, job, text):
+        try:
+            response = self.client.chat_postMessage(
+                channel=job.channel, thread_ts=job.threadTS, text=text)
+            if job.threadTS is None:
+                job.threadTS = response['ts']
+        except Exception as e:
+            log.warning("⚠️ Job %s could not post progress: %s", job.id, e)
+
+    def _sync(self, job):
+        try:
+            if self.coordinator.cancelRequested(job.id):
+                self._stop(job)
+            self.coordinator.publishJob(job)
+        except Exception as e:
+            log.warning("⚠️ Job %s could not sync with the coordination store: %s", job.id, e)
+
+    def _report(self, job, done):
+        lastPost = time.time()
+        wait = self.interval if self.coordinator is None else min(self.poll, self.interval)
+        while not done.wait(wait):
+            if self.coordinator is not None:
+                self._sync(job)
+            if time.time() - lastPost >= self.interval:
+                self._post(job, f"⏳ {job.summary()}")
+                lastPost = time.time()
+
+    def _run(self, job, task, onDone):
+        if job.status == 'queued':
+            job.status = 'running'
+        self._post(job, f"🚀 Started job `{job.id}` ({job.kind})")
+        done = threading.Event()
+        threading.Thread(
+            target=self._report, args=(job, done), daemon=True).start()
+
+        try:
+            task(job)
+            job.status = 'cancelled' if job.stopEvent.is_set() else 'done'
+        except Exception as e:
+            job.status = 'failed'
+            job.error = str(e)
+            log.exception("❌ Job %s failed: %s", job.id, e)
+        finally:
+            job.finished = time.time()
+            done.set()
+            if self.coordinator is not None:
+                self._sync(job)
+            if job.lease is not None:
+                job.lease.release()
+
+        self._post(job, f"🏁 {job.summary()}")
+        if onDone and job.status == 'done':
+            onDone(job)
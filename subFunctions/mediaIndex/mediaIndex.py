@@ -0,0 +1,151 @@
+import os
+import random
+import threading
+import logging
+
+
+log = logging.getLogger(__name__)
+
+
+class Folder:
+    """
+    One indexed directory.
+
+    Attributes:
+        mtime (int): Directory mtime when it was last listed
+        files (list): File names directly inside the folder
+        dirs (list): Sub-directory names
+        bag (list): Remaining picks for no-repeat mode
+    """
+
+    def __init__(self, mtime, files, dirs):
+        self.mtime = mtime
+        self.files = files
+        self.dirs = dirs
+        self.bag = []
+
+
+class MediaIndex:
+    """
+    In-memory index of the media folders (img/, audio/ ...).
+
+    Built once at startup and kept current by a background thread that
+    stats every known directory and re-lists only the ones whose mtime
+    changed. Picks are O(1) per folder, and `--list/` lookups only ever
+    resolve against folders that are in the index.
+
+    Args:
+        roots (list): Top level folders to index, relative to the bot's cwd
+        rescanInterval (float): Seconds between mtime checks (default: 30)
+        noRepeat (bool): Cycle through a shuffled bag instead of sampling
+            with replacement, so a folder repeats only after every file was sent
+    """
+
+    def __init__(self, roots, rescanInterval=30, noRepeat=False):
+        self.roots = list(roots)
+        self.rescanInterval = rescanInterval
+        self.noRepeat = noRepeat
+        self.folders = {}
+        self.lock = threading.Lock()
+        self.stopEvent = threading.Event()
+        self.rescan()
+
+    def _list(self, path):
+        files, dirs = [], []
+        with os.scandir(path) as it:
+            for entry in it:
+                (dirs if entry.is_dir() else files).append(entry.name)
+        return sorted(files), sorted(dirs)
+
+    def rescan(self):
+        """
+        Re-list changed directories and drop ones that disappeared.
+
+        Returns:
+            int: Number of directories that were re-listed
+        """
+        folders = dict(self.folders)
+        seen = set()
+        changed = 0
+        stack = [(root,) for root in self.roots]
+
+        while stack:
+            key = stack.pop()
+            path = os.path.join(*key)
+            try:
+                mtime = os.stat(path).st_mtime_ns
+            except FileNotFoundError:
+                continue
+            if not os.path.isdir(path):
+                continue
+            seen.add(key)
+
+            folder = folders.get(key)
+            if folder is None or folder.mtime != mtime:
+                files, dirs = self._list(path)
+                folder = Folder(mtime, files, dirs)
+                folders[key] = folder
+                changed += 1
+            stack.extend(key + (d,) for d in folder.dirs)
+
+        for key in list(folders):
+            if key not in seen:
+                del folders[key]
+
+        # Swap in one assignment so readers never see a half-built index
+        with self.lock:
+            self.folders = folders
+        if changed:
+            log.info("🗂️ Media index refreshed (%d folders re-listed)", changed)
+        return changed
+
+    def _watch(self):
+        while not self.stopEvent.wait(self.rescanInterval):
+            try:
+                self.rescan()
+            except OSError as e:
+                log.warning("⚠️ Media rescan failed: %s", e)
+
+    def start(self):
+        threading.Thread(target=self._watch, name='media-index', daemon=True).start()
+
+    def stop(self):
+        self.stopEvent.set()
+
+    def folder(self, segments):
+        return self.folders.get(tuple(seg for seg in segments if seg))
+
+    def children(self, segments):
+        """
+        Returns:
+            list: Entry names of an indexed folder, or None if not indexed
+        """
+        folder = self.folder(segments)
+        if folder is None:
+            return None
+        return folder.dirs + folder.files
+
+    def pick(self, segments, fallback=None):
+        """
+        Pick a random file from an indexed folder, or from `fallback` when
+        `segments` is not a known folder with files in it.
+
+        Returns:
+            str: Path of the picked file, or None if nothing is available
+        """
+        key = tuple(seg for seg in segments if seg)
+        folder = self.folders.get(key)
+        if (folder is None or not folder.files) and fallback:
+            key = tuple(fallback)
+            folder = self.folders.get(key)
+        if folder is None or not folder.files:
+            return None
+
+        if self.noRepeat:
+            with self.lock:
+                if not folder.bag:
+                    folder.bag = random.sample(folder.files, len(folder.files))
+                name = folder.bag.pop()
+        else:
+            name = folder.files[random.randrange(len(folder.files))]
+        return os.path.join(*key, name)
@@ -0,0 +1,19 @@
+from slack_sdk.errors import SlackApiError
+from slack_sdk.web.async_client import AsyncWebClient
+from subFunctions.metrics.metrics import apiCalls, apiLatency, recordApiError
+
+
+class InstrumentedAsyncWebClient(AsyncWebClient):
+    """
+    AsyncWebClient counterpart of InstrumentedWebClient. Kept out of
+    metrics.py so the sync runtime never imports aiohttp.
+    """
+
+    async def api_call(self, api_method, *args, **kwargs):
+        apiCalls.inc(method=api_method)
+        try:
+            with apiLatency.time(method=api_method):
+                return await super().api_call(api_method, *args, **kwargs)
+        except SlackApiError as e:
+            recordApiError(api_method, e)
+            raise
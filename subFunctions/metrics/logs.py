@@ -0,0 +1,49 @@
+import os
+import random
+import logging
+
+
+class SampleFilter(logging.Filter):
+    """
+    Let through only a fraction of DEBUG records, so per-message chatter
+    can stay on in production without flooding the output.
+    """
+
+    def __init__(self, rate):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record):
+        return record.levelno > logging.DEBUG or random.random() < self.rate
+
+
+class KVFormatter(logging.Formatter):
+    """
+    One line per record: time, level, logger, message, then key=value
+    pairs passed as `extra=kv(...)`.
+    """
+
+    def format(self, record):
+        line = super().format(record)
+        fields = getattr(record, 'fields', None)
+        if fields:
+            line += ' ' + ' '.join(f"{k}={v!r}" for k, v in fields.items())
+        return line
+
+
+def kv(**fields):
+    return {'fields': fields}
+
+
+def setupLogging():
+    """
+    Configure the root logger from the `logLevel` (default INFO) and
+    `logSample` (fraction of DEBUG records kept, default 0.01) env vars.
+    """
+    handler = logging.StreamHandler()
+    handler.setFormatter(KVFormatter('%(asctime)s %(levelname)s %(name)s %(message)s'))
+    handler.addFilter(SampleFilter(float(os.getenv('logSample', 0.01))))
+
+    root = logging.getLogger()
+    root.handlers = [handler]
+    root.setLevel(os.getenv('logLevel', 'INFO').upper())
@@ -0,0 +1,279 @@
+import time
+import bisect
+import inspect
+import functools
+import threading
+import logging
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from slack_sdk import WebClient
+from slack_sdk.errors import SlackApiError
+
+
+log = logging.getLogger(__name__)
+
+
+# Seconds; covers a dict lookup up to a multi-second Inkscape render
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+def labelKey(labels: dict):
+    return tuple(sorted(labels.items()))
+
+
+def labelText(key):
+    if not key:
+        return ''
+    return '{' + ','.join(f'{k}="{v}"' for k, v in key) + '}'
+
+
+class Counter:
+    def __init__(self, name, help):
+        self.name = name
+        self.help = help
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = labelKey(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self.lock:
+            for key, value in sorted(self.values.items()):
+                lines.append(f"{self.name}{labelText(key)} {value}")
+        return lines
+
+
+class Gauge(Counter):
+    def set(self, value, **labels):
+        with self.lock:
+            self.values[labelKey(labels)] = value
+
+    def render(self):
+        lines = super().render()
+        lines[1] = f"# TYPE {self.name} gauge"
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, help, buckets=BUCKETS):
+        self.name = name
+        self.help = help
+        self.buckets = buckets
+        self.series = {}
+        self.lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = labelKey(labels)
+        i = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            counts, total = self.series.get(key, ([0] * (len(self.buckets) + 1), 0.0))
+            counts[i] += 1
+            self.series[key] = (counts, total + value)
+
+    def time(self, **labels):
+        return Timer(self, labels)
+
+    def quantile(self, q, key):
+        """
+        Estimate a quantile from the bucket counts (upper bucket bound).
+        """
+        counts, _ = self.series[key]
+        target = q * sum(counts)
+        seen = 0
+        for bound, count in zip(self.buckets + (float('inf'),), counts):
+            seen += count
+            if seen >= target:
+                return bound
+        return float('inf')
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self.lock:
+            for key, (counts, total) in sorted(self.series.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + ('+Inf',), counts):
+                    cumulative += count
+                    bkey = key + (('le', bound),)
+                    lines.append(f"{self.name}_bucket{labelText(bkey)} {cumulative}")
+                lines.append(f"{self.name}_sum{labelText(key)} {total}")
+                lines.append(f"{self.name}_count{labelText(key)} {cumulative}")
+        return lines
+
+
+class Timer:
+    """
+    Context manager and decorator observing elapsed seconds into a
+    Histogram. Works on plain functions and coroutines; wrapped Bolt
+    listeners keep their signature because Bolt unwraps __wrapped__.
+    """
+
+    def __init__(self, histogram, labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start, **self.labels)
+
+    def __call__(self, fn):
+        # A fresh Timer per call, the decorator is shared across threads
+        histogram, labels = self.histogram, self.labels
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def wrapper(*args, **kwargs):
+                with Timer(histogram, labels):
+                    return await fn(*args, **kwargs)
+        else:
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with Timer(histogram, labels):
+                    return fn(*args, **kwargs)
+        return wrapper
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = {}
+        self.lock = threading.Lock()
+
+    def _get(self, cls, name, help):
+        with self.lock:
+            if name not in self.metrics:
+                self.metrics[name] = cls(name, help)
+            return self.metrics[name]
+
+    def counter(self, name, help=''):
+        return self._get(Counter, name, help)
+
+    def gauge(self, name, help=''):
+        return self._get(Gauge, name, help)
+
+    def histogram(self, name, help=''):
+        return self._get(Histogram, name, help)
+
+    def render(self):
+        lines = []
+        with self.lock:
+            metrics = list(self.metrics.values())
+        for metric in metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+    def summary(self):
+        """
+        Short human readable digest for the `--stats` command.
+        """
+        lines = []
+        with self.lock:
+            metrics = list(self.metrics.values())
+        for metric in metrics:
+            if isinstance(metric, Histogram):
+                with metric.lock:
+                    keys = list(metric.series)
+                for key in keys:
+                    counts, total = metric.series[key]
+                    n = sum(counts)
+                    lines.append(
+                        f"{metric.name}{labelText(key)}: n={n} "
+                        f"avg={total / n:.3f}s p50<={metric.quantile(0.5, key)}s "
+                        f"p99<={metric.quantile(0.99, key)}s")
+            else:
+                with metric.lock:
+                    items = list(metric.values.items())
+                for key, value in items:
+                    lines.append(f"{metric.name}{labelText(key)}: {value:g}")
+        return '\n'.join(lines) or "No metrics recorded yet"
+
+
+REGISTRY = Registry()
+
+commandLatency = REGISTRY.histogram(
+    'bot_command_seconds', 'Latency of -- message commands')
+listenerLatency = REGISTRY.histogram(
+    'bot_listener_seconds', 'Latency of slash commands, actions and views')
+apiLatency = REGISTRY.histogram(
+    'slack_api_seconds', 'Latency of Slack Web API calls')
+apiCalls = REGISTRY.counter('slack_api_calls_total', 'Slack Web API calls')
+apiErrors = REGISTRY.counter('slack_api_errors_total', 'Slack Web API errors')
+apiRateLimited = REGISTRY.counter(
+    'slack_api_ratelimited_total', 'Slack Web API ratelimited responses')
+deletedMessages = REGISTRY.counter(
+    'sweep_deleted_total', 'Messages deleted by --hookie sweeps')
+renderLatency = REGISTRY.histogram(
+    'card_render_seconds', 'Card SVG fill and rasterize time')
+cardQueueDepth = REGISTRY.gauge(
+    'card_queue_depth', 'Card renders waiting or running in the render pool')
+cardQueueWait = REGISTRY.histogram(
+    'card_queue_seconds', 'Time a card render waited for a pool worker')
+cardRejected = REGISTRY.counter(
+    'card_rejected_total', 'Card requests turned away because the render queue was full')
+rejectedMessages = REGISTRY.counter(
+    'bot_messages_rejected_total', 'Message events dropped before dispatch, per stage')
+
+
+def commandMetrics(ctx, nxt):
+    """
+    CommandRouter middleware timing every dispatched command, labelled by
+    the route it matched (never the raw text, so users cannot mint labels).
+    """
+    with commandLatency.time(command=ctx.route):
+        return nxt(ctx)
+
+
+async def acommandMetrics(ctx, nxt):
+    with commandLatency.time(command=ctx.route):
+        return await nxt(ctx)
+
+
+def recordApiError(method, e):
+    error = e.response.get('error', 'unknown') if e.response else 'unknown'
+    apiErrors.inc(method=method, error=error)
+    if error == 'ratelimited':
+        apiRateLimited.inc(method=method)
+
+
+class InstrumentedWebClient(WebClient):
+    """
+    WebClient counting calls, errors and ratelimited answers per method.
+    """
+
+    def api_call(self, api_method, *args, **kwargs):
+        apiCalls.inc(method=api_method)
+        try:
+            with apiLatency.time(method=api_method):
+                return super().api_call(api_method, *args, **kwargs)
+        except SlackApiError as e:
+            recordApiError(api_method, e)
+            raise
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path != '/metrics':
+            self.send_error(404)
+            return
+        body = REGISTRY.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def startMetricsServer(port, host='127.0.0.1'):
+    """
+    Serve the Prometheus text format on http://host:port/metrics.
+    """
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name='metrics', daemon=True).start()
+    log.info("📈 Metrics on http://%s:%d/metrics", host, port)
+    return server
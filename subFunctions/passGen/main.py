@@ -1,58 +1,150 @@
-import random
 import string
+import secrets
 
 
-def passGen():
-    """
-    Generate a strong random password.
+SYMBOLS = "!@#$%^&*.:;~'`\"*/\\+?-,_|=()[]{}<>"
+
+# Character classes a policy can require
+CLASSES = {
+    'upper': string.ascii_uppercase,
+    'lower': string.ascii_lowercase,
+    'digits': string.digits,
+    'symbols': SYMBOLS,
+}
+
+# Used for whatever parems.json's `passPolicy` leaves out
+DEFAULT_POLICY = {
+    'length': 12,
+    'require': ['upper', 'lower', 'digits', 'symbols'],
+    'exclude': '',
+    'maxCount': 5000,
+    'maxLength': 128,
+    'inlineMax': 10,
+}
+
 
-    The function creates a 12-character random password containing
-    a mix of uppercase letters, lowercase letters, digits, and symbols.
-    It guarantees inclusion of characters from all four sets to maximize entropy,
-    then fills the rest of the password with random characters from the combined set.
+def loadPolicy(parems: dict):
+    """
+    The `passPolicy` of parems.json over DEFAULT_POLICY.
+    """
+    return {**DEFAULT_POLICY, **parems.get('passPolicy', {})}
 
-    Process:
-    - Defines four character sets: uppercase, lowercase, digits, and symbols.
-    - Randomly samples all sets to ensure diversity.
-    - Selects one random character from each chosen set.
-    - Adds 8 additional random characters from the combined sets.
-    - Shuffles the characters to remove ordering patterns.
-    - Returns the password as a string.
 
+def policyAlphabet(policy: dict):
+    """
     Returns:
-        str: A randomized, secure password.
+        tuple: (alphabet string, list of required class strings), both
+            without the policy's excluded characters
+    """
+    exclude = set(policy.get('exclude', ''))
+    require = policy.get('require', DEFAULT_POLICY['require'])
+    unknown = [name for name in require if name not in CLASSES]
+    if unknown:
+        raise ValueError(f"Unknown character classes {unknown}")
 
-    Example:
-        >>> passGen()
-        "A2g@D$e1J{9q"
+    classes = {name: ''.join(dict.fromkeys(c for c in chars if c not in exclude))
+               for name, chars in CLASSES.items()}
+    empty = [name for name in require if not classes[name]]
+    if empty:
+        raise ValueError(f"Every character of {empty} is excluded")
+
+    # All classes are drawn from; `require` only says which must appear
+    alphabet = ''.join(dict.fromkeys(''.join(classes.values())))
+    return alphabet, [classes[name] for name in require]
+
+
+def checkPolicy(policy: dict):
+    """
+    Raise ValueError unless `policy` (already merged over DEFAULT_POLICY)
+    can generate passwords, so a bad parems.json is caught at config load
+    rather than on the first `--passGen`.
+    """
+    for key in ('length', 'maxCount', 'maxLength', 'inlineMax'):
+        value = policy[key]
+        if not isinstance(value, int) or isinstance(value, bool) or value < 1:
+            raise ValueError(f"{key} must be a positive integer, not {value!r}")
+    if not isinstance(policy['require'], list) or not all(isinstance(r, str) for r in policy['require']):
+        raise ValueError("require must be a list of class names")
+    if not isinstance(policy['exclude'], str):
+        raise ValueError("exclude must be a string")
+    if policy['length'] < len(policy['require']):
+        raise ValueError(f"length {policy['length']} cannot hold all "
+                         f"{len(policy['require'])} required classes")
+    if policy['length'] > policy['maxLength']:
+        raise ValueError(f"length {policy['length']} is over maxLength {policy['maxLength']}")
+    policyAlphabet(policy)
 
-    Notes:
-        - Current implementation produces a 12-character password (1 from each set + 8 extra).
-        - To adjust length or complexity, modify the number of additional characters added.
-        - The symbol set includes characters often disallowed in certain systems;
-          consider pruning if targeting specific services.
+
+def randomChars(alphabet: str, n: int):
+    """
+    `n` characters drawn uniformly from `alphabet` with `secrets`.
+
+    Random bytes are read in bulk and mapped through one translation table:
+    bytes past the largest multiple of len(alphabet) are deleted rather than
+    folded back (which would favour the first characters), and everything
+    else maps to alphabet[byte % len(alphabet)].
+    """
+    size = len(alphabet)
+    if not 0 < size <= 256:
+        raise ValueError("Alphabet must hold 1 to 256 characters")
+    limit = 256 - 256 % size
+    table = bytes(ord(alphabet[b % size]) if b < limit else 0 for b in range(256))
+    reject = bytes(range(limit, 256))
+
+    chunks, have = [], 0
+    while have < n:
+        # Over-read by the expected rejection rate so one read usually does
+        chunk = secrets.token_bytes((n - have) * 256 // limit + 16).translate(table, reject)
+        chunks.append(chunk)
+        have += len(chunk)
+    return b''.join(chunks)[:n].decode('ascii')
+
+
+def passBatch(count: int, length: int = None, policy: dict = None):
     """
-    # Define character sets
-    upperCase = string.ascii_uppercase
-    lowerCase = string.ascii_lowercase
-    numbers = string.digits
-    symbols = "!@#$%^&*.:;~'`\"*/\\+?-,_|=()[]{}<>"
+    Generate `count` passwords in bulk.
+
+    Characters for the whole batch are drawn in one pass (see randomChars)
+    and cut into passwords. A password missing one of the required classes
+    is redrawn whole in the next pass, which keeps every password uniform
+    over all valid ones instead of patching classes in at fixed slots.
 
-    # Ensure at least 3 different types are included in the password
-    chosenSets = random.sample([upperCase, lowerCase, numbers, symbols], 4)
-    print(f"Choosen Sets: {chosenSets}")
+    Args:
+        count (int): Number of passwords
+        length (int): Characters per password (default: the policy's length)
+        policy (dict): See DEFAULT_POLICY (default: DEFAULT_POLICY)
 
-    # Ensure the password is 12 characters long: one from each set thrice
-    password = [random.choice(s) for s in chosenSets]
+    Returns:
+        list: `count` password strings
+    """
+    policy = {**DEFAULT_POLICY, **(policy or {})}
+    length = length or policy['length']
+    alphabet, required = policyAlphabet(policy)
+    if length < len(required):
+        raise ValueError(f"Length {length} cannot hold all {len(required)} required classes")
+    required = [frozenset(chars) for chars in required]
 
-    # Add additional 8 characters from combined chosen sets
-    combined = ''.join(chosenSets)
-    password += random.choices(combined, k=8)
+    passwords = []
+    while len(passwords) < count:
+        missing = count - len(passwords)
+        chars = randomChars(alphabet, missing * length)
+        for i in range(0, len(chars), length):
+            password = chars[i:i + length]
+            used = set(password)
+            if all(not used.isdisjoint(cls) for cls in required):
+                passwords.append(password)
+    return passwords
 
-    # Shuffle to avoid predictable sequences
-    random.shuffle(password)
 
-    return ''.join(password)
+def passGen(length: int = None, policy: dict = None):
+    """
+    Generate one password, see passBatch.
+
+    Example:
+        >>> passGen()
+        "A2g@D$e1J{9q"
+    """
+    return passBatch(1, length, policy)[0]
 
 
 if __name__ == '__main__':
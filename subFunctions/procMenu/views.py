@@ -0,0 +1,168 @@
+import threading
+import logging
+
+
+log = logging.getLogger(__name__)
+
+
+# Block Kit limits
+MAX_OPTIONS = 100
+MAX_BLOCKS = 100
+MAX_OPTION_TEXT = 75
+MAX_MESSAGE_BLOCKS = 50
+MAX_SECTION_TEXT = 3000
+
+_compiled = {}
+_compileLock = threading.Lock()
+
+
+def option(cmd: str):
+    text = cmd if len(cmd) <= MAX_OPTION_TEXT else cmd[:MAX_OPTION_TEXT - 1] + "…"
+    return {"text": {"type": "plain_text", "text": text}, "value": cmd}
+
+
+def categorySelect(key: str, cmds: list):
+    """
+    Build the select element for one category.
+
+    Up to 100 commands fit a plain static_select. Bigger categories switch
+    to an external_select served by `procOptions`, so the modal never
+    carries more options than Slack accepts.
+    """
+    select = {
+        "action_id": f"{key}_select",
+        "placeholder": {"type": "plain_text", "text": f"Select {key}"},
+    }
+    if len(cmds) <= MAX_OPTIONS:
+        select["type"] = "static_select"
+        select["options"] = [option(cmd) for cmd in cmds]
+    else:
+        select["type"] = "external_select"
+        # Opening the menu already lists the first matches
+        select["min_query_length"] = 0
+    return select
+
+
+def compileView(data: dict):
+    blocks = []
+    for key, val in data.items():
+        if len(blocks) == MAX_BLOCKS:
+            log.warning("⚠️ /procmenu shows only the first %d categories", MAX_BLOCKS)
+            break
+        elm = {
+            "type": "section",
+            "text": {"type": "mrkdwn", "text": f"*Choose {key}:*"},
+            "accessory": categorySelect(key, list(val.keys()))
+        }
+        blocks.append(elm)
+
+    return {
+        "type": "modal",
+        "callback_id": "procHandler",
+        "title": {"type": "plain_text", "text": "Multiple Selections"},
+        "submit": {"type": "plain_text", "text": "Submit"},
+        "close": {"type": "plain_text", "text": "Cancel"},
+        "blocks": blocks
+    }
+
+
+def slackListView(data: dict, channelID=None, version=None):
+    """
+    Return the /procmenu modal for `data`.
+
+    The category blocks are compiled once per config `version` and reused;
+    each request only adds its own private_metadata on a shallow copy.
+    Without a version the view is compiled from scratch.
+    """
+    modalView = None
+    if version is not None:
+        with _compileLock:
+            modalView = _compiled.get(version)
+    if modalView is None:
+        modalView = compileView(data)
+        if version is not None:
+            with _compileLock:
+                # Only the live version is ever asked for again
+                _compiled.clear()
+                _compiled[version] = modalView
+
+    modalView = dict(modalView)
+    # Store the original channel in private_metadata
+    if channelID:
+        modalView["private_metadata"] = channelID
+
+    return modalView
+
+
+def procOptions(proc: dict, actionID: str, query: str):
+    """
+    Options for an external_select category, filtered by the typed query.
+    """
+    category = actionID.replace("_select", "")
+    query = query.lower()
+    matches = [cmd for cmd in proc.get(category, {}) if query in cmd.lower()]
+    return [option(cmd) for cmd in matches[:MAX_OPTIONS]]
+
+
+def procSelections(values: dict, proc: dict):
+    """
+    Pull the chosen proclamation of every category out of a submitted
+    procHandler view state.
+
+    Returns:
+        dict: category -> {"key": command, "value": proclamation text}
+    """
+    selections = {}
+
+    # Extract all selections
+    for blockID, blockData in values.items():
+        for actionID, actionData in blockData.items():
+            if actionData.get("selected_option"):
+                # Get the category name (remove "_select" suffix)
+                category = actionID.replace("_select", "")
+                selectedKey = actionData["selected_option"]["value"]
+
+                # Get the actual value from your proc data
+                if category in proc and selectedKey in proc[category]:
+                    selections[category] = {
+                        "key": selectedKey,
+                        "value": proc[category][selectedKey]
+                    }
+
+    return selections
+
+
+def selectionText(category: str, selection: dict):
+    return f"🎯 {category.title()}: {selection['key']}\n{selection['value']}"
+
+
+def selectionMessages(selections: dict, batched=True):
+    """
+    Turn submitted selections into chat_postMessage arguments.
+
+    Batched, every selection becomes a section of one Block Kit message,
+    split into further messages only past the 50-block limit. Otherwise
+    each selection is its own plain message, as before.
+
+    Returns:
+        list: kwargs (text, and blocks when batched) for each message
+    """
+    if not batched:
+        return [{"text": selectionText(category, selection)}
+                for category, selection in selections.items()]
+
+    blocks = []
+    for category, selection in selections.items():
+        text = selectionText(category, selection)
+        for i in range(0, len(text), MAX_SECTION_TEXT):
+            blocks.append({
+                "type": "section",
+                "text": {"type": "mrkdwn", "text": text[i:i + MAX_SECTION_TEXT]}
+            })
+
+    # Notification / fallback text
+    summary = "🎯 " + ", ".join(s['key'] for s in selections.values())
+    return [
+        {"text": summary, "blocks": blocks[i:i + MAX_MESSAGE_BLOCKS]}
+        for i in range(0, len(blocks), MAX_MESSAGE_BLOCKS)
+    ]
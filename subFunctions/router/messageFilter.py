@@ -0,0 +1,75 @@
+import logging
+from slack_bolt import BoltResponse
+from subFunctions.metrics.metrics import rejectedMessages
+from subFunctions.metrics.logs import kv
+
+
+log = logging.getLogger(__name__)
+
+
+# Stage names, in the order they are checked (cheapest and most common first)
+NOT_COMMAND = 'not_command'
+BOT = 'bot'
+UNAUTHORIZED = 'unauthorized'
+
+
+class MessageFilter:
+    """
+    Global Bolt middleware dropping `message` events that can never become a
+    command, before Bolt matches listeners or hands anything to a worker.
+
+    Nearly every message in a large workspace is plain chatter, so the
+    `--` prefix test runs first, then the bot check, then a set lookup on
+    the user. Every drop is counted per stage in `rejectedMessages`.
+    Unauthorized users still get the bot's refusal, sent from here.
+
+    Args:
+        userIDs: Users allowed to run commands
+        prefix (str): Text every command starts with (default: '--')
+    """
+
+    def __init__(self, userIDs, prefix='--'):
+        self.userIDs = frozenset(userIDs)
+        self.prefix = prefix
+
+    def stage(self, event: dict):
+        """
+        Returns:
+            str: The stage rejecting this message event, or None to let it through
+        """
+        text = event.get('text')
+        if not text or not text.startswith(self.prefix):
+            return NOT_COMMAND
+        if ('[bot]' not in text) and (event.get('bot_id') or event.get('subtype') == 'bot_message'):
+            return BOT
+        if event.get('user') not in self.userIDs:
+            return UNAUTHORIZED
+        return None
+
+    def _check(self, body):
+        event = body.get('event')
+        if body.get('type') != 'event_callback' or not event or event.get('type') != 'message':
+            return None
+        stage = self.stage(event)
+        if stage:
+            rejectedMessages.inc(stage=stage)
+        return stage
+
+    def middleware(self, body, say, next):
+        stage = self._check(body)
+        if stage is None:
+            return next()
+        if stage == UNAUTHORIZED:
+            log.warning("unauthorized command", extra=kv(user=body['event'].get('user')))
+            say("The Light does not shine upon thee!!!")
+        # Handled: returning a response stops Bolt without an "unhandled" warning
+        return BoltResponse(status=200, body='')
+
+    async def amiddleware(self, body, say, next):
+        stage = self._check(body)
+        if stage is None:
+            return await next()
+        if stage == UNAUTHORIZED:
+            log.warning("unauthorized command", extra=kv(user=body['event'].get('user')))
+            await say("The Light does not shine upon thee!!!")
+        return BoltResponse(status=200, body='')
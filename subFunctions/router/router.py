@@ -0,0 +1,186 @@
+import inspect
+
+
+class PrefixTrie:
+    """
+    Character trie mapping command prefixes (e.g. '--card/') to handlers.
+
+    `longest(text)` walks the text once and returns the longest registered
+    prefix, so lookup cost depends on the command length, not on how many
+    prefixes are registered.
+    """
+
+    def __init__(self):
+        self.root = {}
+
+    def insert(self, prefix, value):
+        node = self.root
+        for ch in prefix:
+            node = node.setdefault(ch, {})
+        node[None] = (prefix, value)
+
+    def longest(self, text):
+        node = self.root
+        found = node.get(None)
+        for ch in text:
+            node = node.get(ch)
+            if node is None:
+                break
+            found = node.get(None, found)
+        return found
+
+
+# Route of every proclamation, one label however many keys there are
+PROCLAMATION = '<proclamation>'
+
+
+class CommandCtx:
+    """
+    Everything a command handler needs, passed as the single argument.
+
+    Attributes:
+        cmnd (str): The command token (e.g. '--card/cardType1')
+        text (str): Full message text
+        args (list): Path segments after the matched prefix
+        route (str): What matched: the exact command, the prefix, or
+            PROCLAMATION; set by dispatch
+        event (dict): Raw Slack event
+        channel (str): Channel the command came from
+        user (str): User who sent the command
+        say: Bolt `say` function for the channel
+        cfg: Config snapshot the whole command runs against (optional)
+    """
+
+    def __init__(self, cmnd, text, event, say):
+        self.cmnd = cmnd
+        self.text = text
+        self.event = event
+        self.channel = event.get('channel', '')
+        self.user = event.get('user')
+        self.say = say
+        self.args = []
+        self.route = None
+        self.cfg = None
+
+
+class CommandRouter:
+    """
+    Indexed command dispatch for `--` message commands.
+
+    Lookup order is exact commands (dict), then proclamations (prebuilt
+    key -> text index), then prefix commands (trie). Every handler takes a
+    single CommandCtx, and middleware registered with `use()` wraps every
+    dispatch as `middleware(ctx, handler)`.
+    """
+
+    def __init__(self):
+        self.exact = {}
+        self.prefixes = PrefixTrie()
+        self.procIndex = {}
+        self.middleware = []
+
+    def command(self, name):
+        def register(fn):
+            self.exact[name] = fn
+            return fn
+        return register
+
+    def prefix(self, prefix):
+        def register(fn):
+            self.prefixes.insert(prefix, fn)
+            return fn
+        return register
+
+    def use(self, middleware):
+        self.middleware.append(middleware)
+        return middleware
+
+    @staticmethod
+    def indexProclamations(proc: dict):
+        """
+        Build the proclamation index from `proclamations.json` contents.
+        A key present in several categories maps to all of its texts.
+        """
+        index = {}
+        for category in proc.values():
+            for key, text in category.items():
+                index.setdefault(key, []).append(text)
+        return {key: tuple(texts) for key, texts in index.items()}
+
+    def setProclamations(self, proc: dict):
+        self.procIndex = self.indexProclamations(proc)
+
+    def _procIndex(self, ctx):
+        # Prefer the index of the config snapshot the command runs against
+        return ctx.cfg.procIndex if ctx.cfg is not None else self.procIndex
+
+    def sayProclamation(self, ctx):
+        for text in self._procIndex(ctx)[ctx.cmnd]:
+            ctx.say(text)
+
+    def resolve(self, cmnd, procIndex=None):
+        """
+        Returns:
+            tuple: (handler, args, route) or (None, [], None) when nothing matches
+        """
+        if procIndex is None:
+            procIndex = self.procIndex
+        handler = self.exact.get(cmnd)
+        if handler:
+            return handler, [], cmnd
+        if cmnd in procIndex:
+            return self.sayProclamation, [], PROCLAMATION
+
+        match = self.prefixes.longest(cmnd)
+        if match:
+            prefix, handler = match
+            args = [seg for seg in cmnd[len(prefix):].split('/') if seg]
+            return handler, args, prefix
+        return None, [], None
+
+    def dispatch(self, ctx):
+        """
+        Run the handler for `ctx.cmnd` through the middleware chain.
+
+        Returns:
+            bool: False if no handler matched
+        """
+        handler, ctx.args, ctx.route = self.resolve(ctx.cmnd, self._procIndex(ctx))
+        if handler is None:
+            return False
+
+        call = handler
+        for mw in reversed(self.middleware):
+            call = (lambda m, nxt: lambda c: m(c, nxt))(mw, call)
+        call(ctx)
+        return True
+
+    async def asayProclamation(self, ctx):
+        for text in self._procIndex(ctx)[ctx.cmnd]:
+            await ctx.say(text)
+
+    async def adispatch(self, ctx):
+        """
+        Async twin of `dispatch` for the AsyncApp runtime. Handlers and
+        middleware may be coroutines or plain functions.
+
+        Returns:
+            bool: False if no handler matched
+        """
+        handler, ctx.args, ctx.route = self.resolve(ctx.cmnd, self._procIndex(ctx))
+        if handler is None:
+            return False
+        if handler == self.sayProclamation:
+            handler = self.asayProclamation
+
+        async def run(fn, *args):
+            result = fn(*args)
+            if inspect.isawaitable(result):
+                result = await result
+            return result
+
+        call = lambda c: run(handler, c)
+        for mw in reversed(self.middleware):
+            call = (lambda m, nxt: lambda c: run(m, c, nxt))(mw, call)
+        await call(ctx)
+        return True
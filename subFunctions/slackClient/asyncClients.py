@@ -0,0 +1,80 @@
+import asyncio
+import logging
+import aiohttp
+from slack_sdk.errors import SlackApiError
+from slack_sdk.http_retry.builtin_async_handlers import (
+    AsyncConnectionErrorRetryHandler, AsyncServerErrorRetryHandler)
+from subFunctions.slackClient.clients import (
+    RATELIMIT_RETRIES, TRANSPORT_RETRIES, limiter, retryAfter, apiUrl, _clientLock)
+from subFunctions.metrics.asyncMetrics import InstrumentedAsyncWebClient
+
+
+# The asyncio half of clients.py, split out so the sync runtime never
+# imports aiohttp.
+
+log = logging.getLogger(__name__)
+
+_asyncClients = {}
+_session = None
+_sessionLoop = None
+
+
+class AsyncSlackClient(InstrumentedAsyncWebClient):
+    """
+    AsyncWebClient counterpart of SlackClient. All async clients share one
+    aiohttp session, so connections are pooled and kept alive across calls.
+    """
+
+    def __init__(self, token, limiter, **kwargs):
+        super().__init__(
+            token=token,
+            retry_handlers=[AsyncConnectionErrorRetryHandler(max_retry_count=TRANSPORT_RETRIES),
+                            AsyncServerErrorRetryHandler(max_retry_count=TRANSPORT_RETRIES)],
+            **kwargs)
+        self.limiter = limiter
+
+    async def api_call(self, api_method, *args, **kwargs):
+        self.session = sharedSession()
+        bucket = self.limiter.bucket(api_method)
+        for attempt in range(RATELIMIT_RETRIES):
+            await bucket.aacquire()
+            try:
+                return await super().api_call(api_method, *args, **kwargs)
+            except SlackApiError as e:
+                if e.response.get('error') != 'ratelimited' or attempt == RATELIMIT_RETRIES - 1:
+                    raise
+                wait = retryAfter(e)
+                log.warning("⏱️ %s rate limited, backing off %ss", api_method, wait)
+                bucket.backoff(wait)
+
+
+def sharedSession():
+    """
+    The aiohttp session of the running event loop, created on first use.
+    """
+    global _session, _sessionLoop
+    loop = asyncio.get_running_loop()
+    if _session is None or _session.closed or _sessionLoop is not loop:
+        _session = aiohttp.ClientSession()
+        _sessionLoop = loop
+    return _session
+
+
+async def closeSession():
+    if _session is not None and not _session.closed:
+        await _session.close()
+
+
+def getAsyncClient(token):
+    with _clientLock:
+        client = _asyncClients.get(token)
+        if client is None:
+            client = _asyncClients[token] = AsyncSlackClient(token, limiter, base_url=apiUrl())
+        return client
+
+
+def aclientMiddleware(client):
+    async def useSharedClient(context, next):
+        context['client'] = client
+        return await next()
+    return useSharedClient
@@ -0,0 +1,116 @@
+import os
+import copy
+import logging
+import threading
+from slack_sdk import WebClient
+from slack_sdk.errors import SlackApiError
+from slack_sdk.http_retry.builtin_handlers import ConnectionErrorRetryHandler, ServerErrorRetryHandler
+from subFunctions.slackClient.rateLimit import MethodLimiter
+from subFunctions.metrics.metrics import InstrumentedWebClient
+
+
+log = logging.getLogger(__name__)
+
+# `ratelimited` answers retried per call, after the shared backoff
+RATELIMIT_RETRIES = 5
+# Connection resets and 5xx answers retried by slack_sdk itself
+TRANSPORT_RETRIES = 2
+
+# Shared by every client in the process, see MethodLimiter
+limiter = MethodLimiter()
+
+_clients = {}
+_clientLock = threading.Lock()
+
+
+class Cancelled(Exception):
+    """
+    Raised instead of making a call once the calling job's stopEvent is set.
+    """
+
+
+def retryAfter(e):
+    return int(e.response.headers.get("Retry-After", 1))
+
+
+def apiUrl():
+    return os.getenv('slackApiUrl', WebClient.BASE_URL)
+
+
+class SlackClient(InstrumentedWebClient):
+    """
+    WebClient every Slack call in the bot goes through.
+
+    Each call first takes a token from its method's bucket in the shared
+    limiter. A `ratelimited` answer pauses that bucket for Retry-After
+    seconds (for every thread and token) and the call is retried; transient
+    connection and server errors are retried by slack_sdk's retry handlers.
+
+    `waited` adds up the seconds this client's calls spent throttled; see
+    scoped() to count them for one job only, and to stop waiting once the
+    job is cancelled.
+    """
+
+    def __init__(self, token, limiter, **kwargs):
+        super().__init__(
+            token=token,
+            retry_handlers=[ConnectionErrorRetryHandler(max_retry_count=TRANSPORT_RETRIES),
+                            ServerErrorRetryHandler(max_retry_count=TRANSPORT_RETRIES)],
+            **kwargs)
+        self.limiter = limiter
+        self.stopEvent = None
+        self.waited = 0.0
+        self.waitLock = threading.Lock()
+
+    def scoped(self, stopEvent=None):
+        """
+        A copy of this client for one job, sharing its connection settings
+        and limiter but counting `waited` from zero. Once `stopEvent` is set,
+        its calls stop waiting on the limiter (Retry-After included) and
+        raise Cancelled.
+        """
+        scoped = copy.copy(self)
+        scoped.stopEvent = stopEvent
+        scoped.waited = 0.0
+        scoped.waitLock = threading.Lock()
+        return scoped
+
+    def api_call(self, api_method, *args, **kwargs):
+        bucket = self.limiter.bucket(api_method)
+        for attempt in range(RATELIMIT_RETRIES):
+            waited = bucket.acquire(self.stopEvent)
+            if waited:
+                with self.waitLock:
+                    self.waited += waited
+            if self.stopEvent is not None and self.stopEvent.is_set():
+                raise Cancelled(f"{api_method} not sent, the job was cancelled")
+            try:
+                return super().api_call(api_method, *args, **kwargs)
+            except SlackApiError as e:
+                if e.response.get('error') != 'ratelimited' or attempt == RATELIMIT_RETRIES - 1:
+                    raise
+                wait = retryAfter(e)
+                log.warning("⏱️ %s rate limited, backing off %ss", api_method, wait)
+                bucket.backoff(wait)
+
+
+def getClient(token):
+    """
+    Return the process-wide SlackClient for `token`, creating it on first use.
+    """
+    with _clientLock:
+        client = _clients.get(token)
+        if client is None:
+            client = _clients[token] = SlackClient(token, limiter, base_url=apiUrl())
+        return client
+
+
+def clientMiddleware(client):
+    """
+    Bolt global middleware handing listeners the shared `client` instead of
+    the fresh WebClient Bolt builds for every request.
+    """
+    def useSharedClient(context, next):
+        context['client'] = client
+        return next()
+    return useSharedClient
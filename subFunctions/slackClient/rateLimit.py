@@ -0,0 +1,154 @@
+import time
+import asyncio
+import threading
+
+
+# Slack Web API tiers (requests per minute, burst allowance)
+# https://api.slack.com/apis/rate-limits
+TIERS = {
+    1: (1, 1),
+    2: (20, 3),
+    3: (50, 5),
+    4: (100, 10),
+}
+
+# Tier of every method this bot calls. Methods not listed (chat.postMessage
+# and friends have Slack's per-channel "special" limit) are not throttled
+# up front, but still share Retry-After backoff.
+METHOD_TIERS = {
+    'chat.delete': 3,
+    'conversations.history': 3,
+    'conversations.replies': 3,
+    'files.info': 4,
+    'files.getUploadURLExternal': 4,
+    'files.completeUploadExternal': 4,
+    'views.open': 4,
+    'auth.test': 4,
+}
+
+# Stand-in rate for untiered methods: only ever paused by backoff()
+UNLIMITED = (1e9, 10**9)
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket shared by every worker calling one API method.
+
+    Tokens refill continuously at `rate` per second up to `burst`. When Slack
+    answers with `Retry-After`, `backoff()` pauses the whole bucket, so every
+    worker waits once instead of each one hammering the API on its own.
+
+    Args:
+        rate (float): Tokens added per second
+        burst (int): Maximum tokens held at once
+    """
+
+    def __init__(self, rate, burst=1):
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self.tokens = float(self.burst)
+        self.stamp = time.monotonic()
+        self.pausedUntil = 0.0
+        self.lock = threading.Lock()
+
+    @classmethod
+    def forTier(cls, tier):
+        perMin, burst = TIERS[tier]
+        return cls(perMin / 60.0, burst)
+
+    def _refill(self, now):
+        elapsed = now - self.stamp
+        self.stamp = now
+        self.tokens = min(self.burst, self.tokens + elapsed * self.rate)
+
+    def _take(self):
+        """
+        Take a token if one is available.
+
+        Returns:
+            float: 0 when a token was taken, else seconds to wait before retrying
+        """
+        with self.lock:
+            now = time.monotonic()
+            if now < self.pausedUntil:
+                # No refill while Slack has told us to back off
+                self.stamp = now
+                wait = self.pausedUntil - now
+            else:
+                self._refill(now)
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return 0
+                wait = (1 - self.tokens) / self.rate
+            return wait
+
+    def acquire(self, stopEvent=None):
+        """
+        Block until a token is available (or stopEvent is set).
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        start = time.monotonic()
+        while True:
+            wait = self._take()
+            if not wait:
+                break
+            if stopEvent is not None:
+                if stopEvent.wait(wait):
+                    break
+            else:
+                time.sleep(wait)
+        return time.monotonic() - start
+
+    async def aacquire(self):
+        start = time.monotonic()
+        while True:
+            wait = self._take()
+            if not wait:
+                break
+            await asyncio.sleep(wait)
+        return time.monotonic() - start
+
+    def backoff(self, seconds):
+        """
+        Pause every caller of this bucket for `seconds` (from Retry-After).
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.pausedUntil = max(self.pausedUntil, now + float(seconds))
+            # Drain so the restart after the pause is not a burst
+            self.tokens = 0.0
+            self.stamp = now
+
+
+class MethodLimiter:
+    """
+    One TokenBucket per Web API method, created on first use.
+
+    Slack limits each method per app and workspace, so a single limiter is
+    shared by every client in the process, bot and user tokens alike.
+    """
+
+    def __init__(self):
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+    def bucket(self, method):
+        with self.lock:
+            bucket = self.buckets.get(method)
+            if bucket is None:
+                tier = METHOD_TIERS.get(method)
+                if tier is None:
+                    bucket = TokenBucket(*UNLIMITED)
+                else:
+                    bucket = TokenBucket.forTier(tier)
+                self.buckets[method] = bucket
+            return bucket
+
+    def setRate(self, method, perMin, burst):
+        """
+        Override one method's limit (e.g. a benchmark lifting the tier).
+        """
+        with self.lock:
+            self.buckets[method] = TokenBucket(perMin / 60.0, burst)
@@ -0,0 +1,85 @@
+# Block Kit caps a section's text at 3000 characters
+MAX_SECTION_TEXT = 3000
+
+
+def spoilerTitle(command: dict, parems: dict):
+    userId = command['user_id']
+    userName = command['user_name']
+    userEmot = "🫣"
+
+    # Optional: Extract title if provided in brackets
+    if userId in parems['userIds']:
+        userName = parems['userIds'][userId]['name']
+        userEmot = parems['userIds'][userId]['emoji']
+
+    return f"{userName}: Spoiler Alert! {userEmot}"
+
+
+def spoilerBlocks(title: str, spoilerID: str):
+    # Create the spoiler message using Block Kit
+    return [
+        {
+            "type": "section",
+            "text": {
+                "type": "mrkdwn",
+                "text": f"*{title}*\n_Invisible, init._"
+            }
+        },
+        {
+            "type": "actions",
+            "elements": [
+                {
+                    "type": "button",
+                    "text": {
+                            "type": "plain_text",
+                            "text": "🔍 Reveal Spoiler"
+                    },
+                    "action_id": "revealSpoiler",
+                    "style": "primary",
+                    # The spoiler itself lives in the SpoilerStore
+                    "value": spoilerID
+                }
+            ]
+        }
+    ]
+
+
+def revealBlocks(title: str, spoilerTxt: str):
+    body = f"*🔓 {title}*\n\n{spoilerTxt}"
+    # Long spoilers are split over as many sections as they need
+    sections = [
+        {
+            "type": "section",
+            "text": {
+                "type": "mrkdwn",
+                "text": body[i:i + MAX_SECTION_TEXT]
+            }
+        }
+        for i in range(0, len(body), MAX_SECTION_TEXT)
+    ]
+    return sections + [
+        {
+            "type": "actions",
+            "elements": [
+                {
+                    "type": "button",
+                    "text": {
+                        "type": "plain_text",
+                        "text": "🗑️ Delete This"
+                    },
+                    "action_id": "deleteReveal",
+                    "style": "danger",
+                    "value": "deleteSpoilerReveal"
+                }
+            ]
+        },
+        {
+            "type": "context",
+            "elements": [
+                {
+                    "type": "mrkdwn",
+                    "text": "_This spoiler only visible to you, init._"
+                }
+            ]
+        }
+    ]
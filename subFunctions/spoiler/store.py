@@ -0,0 +1,109 @@
+import os
+import time
+import secrets
+import threading
+import logging
+from subFunctions.storage.sqlite import openDB, transaction
+
+
+log = logging.getLogger(__name__)
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS spoilers (
+    id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    text TEXT NOT NULL,
+    channel TEXT,
+    author TEXT,
+    created REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS spoilersCreated ON spoilers (created);
+CREATE TABLE IF NOT EXISTS reveals (
+    spoiler TEXT NOT NULL,
+    user TEXT NOT NULL,
+    revealed REAL NOT NULL,
+    PRIMARY KEY (spoiler, user)
+) WITHOUT ROWID;
+"""
+
+
+class SpoilerStore:
+    """
+    SQLite store for /spoiler posts, so the Reveal button only carries a
+    short id instead of the whole spoiler.
+
+    Spoilers expire `ttl` seconds after they are posted; expired rows and
+    their reveals are evicted lazily, at most once every `evictEvery`
+    seconds. Who revealed what is kept in an indexed `reveals` table.
+
+    Args:
+        path (str): SQLite database file (default: 'cache/spoilers.db')
+        ttl (float): Seconds a spoiler stays revealable (default: 7 days)
+        evictEvery (float): Minimum seconds between eviction passes
+    """
+
+    def __init__(self, path=os.path.join('cache', 'spoilers.db'), ttl=7 * 86400, evictEvery=3600):
+        self.ttl = ttl
+        self.evictEvery = evictEvery
+        self.lastEvict = 0.0
+        self.lock = threading.Lock()
+        self.db = openDB(path, SCHEMA)
+
+    def add(self, title, text, channel=None, author=None):
+        """
+        Returns:
+            str: Short id to put on the Reveal button
+        """
+        spoilerID = secrets.token_urlsafe(8)
+        now = time.time()
+        with self.lock:
+            self.db.execute(
+                "INSERT INTO spoilers (id, title, text, channel, author, created) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (spoilerID, title, text, channel, author, now))
+            if now - self.lastEvict > self.evictEvery:
+                self._evict(now)
+        return spoilerID
+
+    def reveal(self, spoilerID, user):
+        """
+        Look a spoiler up by id and record that `user` revealed it.
+
+        Returns:
+            tuple: (title, text), or None if unknown or expired
+        """
+        now = time.time()
+        with self.lock:
+            row = self.db.execute(
+                "SELECT title, text FROM spoilers WHERE id = ? AND created >= ?",
+                (spoilerID, now - self.ttl)).fetchone()
+            if row is None:
+                return None
+            self.db.execute(
+                "INSERT OR IGNORE INTO reveals (spoiler, user, revealed) VALUES (?, ?, ?)",
+                (spoilerID, user, now))
+        return row
+
+    def revealedBy(self, spoilerID):
+        with self.lock:
+            rows = self.db.execute(
+                "SELECT user FROM reveals WHERE spoiler = ? ORDER BY revealed",
+                (spoilerID,)).fetchall()
+        return [user for (user,) in rows]
+
+    def _evict(self, now):
+        cutoff = now - self.ttl
+        with transaction(self.db):
+            self.db.execute(
+                "DELETE FROM reveals WHERE spoiler IN (SELECT id FROM spoilers WHERE created < ?)",
+                (cutoff,))
+            removed = self.db.execute(
+                "DELETE FROM spoilers WHERE created < ?", (cutoff,)).rowcount
+        self.lastEvict = now
+        if removed:
+            log.info("🧽 Evicted %d expired spoilers", removed)
+
+    def close(self):
+        with self.lock:
+            self.db.close()
@@ -0,0 +1,43 @@
+import os
+import sqlite3
+from contextlib import contextmanager
+
+
+def openDB(path, schema, timeout=5):
+    """
+    Open (creating if needed) one of the bot's SQLite stores.
+
+    The connection is shared by every thread of its store, which serializes
+    access with its own lock, and runs in autocommit mode so single
+    statements need no explicit transaction. WAL lets readers and other
+    instances on the host work while one of them writes.
+
+    Args:
+        path (str): Database file, its folder is created if missing
+        schema (str): `CREATE ... IF NOT EXISTS` script run on every open
+        timeout (float): Seconds to wait on another writer's lock (default: 5)
+
+    Returns:
+        sqlite3.Connection: The open connection
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    db = sqlite3.connect(path, timeout=timeout, check_same_thread=False, isolation_level=None)
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("PRAGMA synchronous=NORMAL")
+    db.executescript(schema)
+    return db
+
+
+@contextmanager
+def transaction(db):
+    """
+    Run the enclosed statements on an autocommit connection as one
+    transaction, rolled back if any of them (or the commit) fails.
+    """
+    db.execute("BEGIN")
+    try:
+        yield db
+        db.execute("COMMIT")
+    except BaseException:
+        db.execute("ROLLBACK")
+        raise